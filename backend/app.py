@@ -2,17 +2,49 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import requests
 import os
-from datetime import datetime
+import json
+import base64
+import threading
+import time
 from dotenv import load_dotenv
+import orjson
 load_dotenv()  # Load environment variables from .env file
+import http_client
+from geo import GeoResolver
+from job_transform import transform_linkedin_jobs
+from job_store import JobStore
+from pipeline import StageTimer, executor, PIPELINE_CALL_TIMEOUT_SECONDS
+from response_cache import ResponseCache, UpstreamError
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+CORS(app, expose_headers=["Server-Timing"])  # Enable CORS for all routes
 
 # LinkedIn API configuration
 API_KEY = os.getenv('API_KEY')#API key from environment variable
   # In production, store this in environment variables
 LINKEDIN_API_URL = "https://api.scrapingdog.com/linkedinjobs"
 
+# Cache of upstream job search responses keyed on the normalized filters
+search_cache = ResponseCache(
+    max_entries=int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '1024')),
+    ttl=int(os.getenv('SEARCH_CACHE_TTL', '300')),  # Served as fresh
+    stale_ttl=int(os.getenv('SEARCH_CACHE_STALE_TTL', '3600'))  # Served while refreshing
+)
+
+# Persistent index of upstream results; fresh entries are served without
+# calling LinkedIn and it backs offline and local search
+job_store = JobStore()
+
+# Job ids carried in a pagination cursor for de-duplication across pages
+SEARCH_CURSOR_MAX_SEEN = int(os.getenv('SEARCH_CURSOR_MAX_SEEN', '500'))
+
+# Filter sets accepted by one bulk search request, and LinkedIn calls the
+# bulk endpoint may have in flight at once across all requests
+BULK_SEARCH_MAX_QUERIES = int(os.getenv('BULK_SEARCH_MAX_QUERIES', '20'))
+BULK_SEARCH_CONCURRENCY = int(os.getenv('BULK_SEARCH_CONCURRENCY', '4'))
+bulk_search_slots = threading.BoundedSemaphore(BULK_SEARCH_CONCURRENCY)
+# Longest a bulk query waits for a free slot before it is reported as failed
+BULK_SEARCH_SLOT_WAIT_SECONDS = float(os.getenv('BULK_SEARCH_SLOT_WAIT_SECONDS', '30'))
+
 # Mapping of frontend filter values to LinkedIn API parameters
 JOB_TYPE_MAPPING = {
     "fullTime": "F",
@@ -39,116 +71,306 @@ EXPERIENCE_MAPPING = {
     "": None
 }
 
-LOCATION_MAPPING = {
-    # Common locations with their LinkedIn geoIds
-    "new york": "103644278",
-    "san francisco": "102277331",
-    "chicago": "102183082", 
-    "seattle": "103679156",
-    "boston": "101835590",
-    "austin": "100025064",
-    "india" : "102713980",
-    "bangalore": "102105699",
-    "mumbai": "102083659",
-    "hyderabad": "102089132",
-    "chennai": "102093119",
-    "delhi": "102090883",
-    "pune": "102179709",
-    "kolkata": "102200003",
-    "ahmedabad": "102096753",
-    "gurgaon": "102115891",
-    "noida": "102180291",
-    "jaipur": "102103260",
-    "chandigarh": "102115878",
-    "kochi": "102100620",
-    "nagpur": "102113739",
-    "indore": "102111733",
-    "bhopal": "102108184",
-    "lucknow": "102113183",
-    "bhubaneswar": "102106297",
-    "surat": "102116134",
-    "vadodara": "102116323",
-    "thiruvananthapuram": "102119642",
-    "patna": "102112594",
-    "guwahati": "102110667",
-    "remote": "103644278",
-        # Default to US-wide for remote
-    "": None
-}
+# Location strings resolve to LinkedIn geoIds through an index built once at
+# startup from data/geo_ids.json (or GEO_DATA_PATH)
+geo_resolver = GeoResolver.from_file()
+
 @app.route('/api/test', methods=['GET'])
 def test():
     return jsonify({"message": "API is working!"}),200
 
+def json_response(payload):
+    """jsonify() with the body serialized by orjson.
+
+    The bytes match jsonify outside debug mode: sorted keys, compact
+    separators and a trailing newline. Payloads that orjson would encode
+    differently (non-ASCII text, which jsonify escapes) or can't encode at
+    all go through jsonify, as does everything in debug mode.
+    """
+    if not app.debug:
+        try:
+            body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            body = None
+        if body is not None and body.isascii():
+            return app.response_class(body, mimetype=app.json.mimetype)
+    return jsonify(payload)
+
+def search_cache_key(params):
+    """Canonical cache key for LinkedIn API parameters, without the API key."""
+    normalized = {
+        k: " ".join(v.lower().split()) if isinstance(v, str) else v
+        for k, v in params.items() if k != "api_key"
+    }
+    return json.dumps(normalized, sort_keys=True)
+
+def encode_cursor(page, seen_ids):
+    """Opaque cursor for the next page, remembering the job ids already returned."""
+    state = {"page": page, "seen": list(seen_ids)[-SEARCH_CURSOR_MAX_SEEN:]}
+    return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+def decode_cursor(cursor):
+    """Return (page, seen job ids) from a cursor, or the first page when there is none."""
+    if not cursor:
+        return 1, []
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        page = int(state["page"])
+        seen = [str(job_id) for job_id in state.get("seen", [])]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if page < 1:
+        raise ValueError("Invalid cursor")
+    return page, seen
+
+def linkedin_search_params(filters, page=1):
+    """LinkedIn API parameters for a set of frontend search filters."""
+    # Extract filter values
+    position = filters.get('position', '')
+    company = filters.get('company', '')
+    location = filters.get('location', '').lower() if filters.get('location') else ''
+    experience_range = filters.get('experience', [0, 10])
+    work_location_type = filters.get('workLocationType', '')
+    job_type = filters.get('jobType', '')
+
+    # Map experience range to LinkedIn experience level
+    exp_level = None
+    if experience_range:
+        min_exp, max_exp = experience_range
+        if max_exp <= 2:
+            exp_level = "1"  # Entry level
+        elif max_exp <= 5:
+            exp_level = "2"  # Associate
+        elif max_exp <= 10:
+            exp_level = "3"  # Mid-Senior level
+        else:
+            exp_level = "4"  # Director and above
+
+    # Convert location to geoId
+    geo_id = geo_resolver.resolve(location)
+
+    # Configure LinkedIn API parameters
+    params = {
+        "api_key": API_KEY,
+        "field": position,  # Job position/title
+        "geoid": geo_id,  # Location ID
+        "page": page,  # Page of results requested by the cursor
+        "sortBy": "R",  # Sort by relevance
+        "jobType": JOB_TYPE_MAPPING.get(job_type),  # Job type
+        "expLevel": exp_level,  # Experience level
+        "workType": WORK_LOCATION_MAPPING.get(work_location_type),  # Remote/Onsite/Hybrid
+        "filterByCompany": company if company else None  # Company filter
+    }
+
+    # Remove None values from parameters
+    return {k: v for k, v in params.items() if v is not None}
+
+def fetch_linkedin_jobs(params, timeout=None):
+    """Call the LinkedIn API, raising UpstreamError on a non-200 response."""
+    response = http_client.get(LINKEDIN_API_URL, params=params, timeout=timeout)
+    if response.status_code != 200:
+        raise UpstreamError(response.status_code, response.text)
+    return response.json()
+
+def fetch_listings(params, timeout=None):
+    """Call the LinkedIn API; returns (raw jobs, listings) without indexing them."""
+    linkedin_jobs = fetch_linkedin_jobs(params, timeout)
+    return linkedin_jobs, transform_linkedin_jobs(linkedin_jobs, [0, 0])
+
+def fetch_and_ingest(params, timeout=None):
+    """Call the LinkedIn API and index the response; returns (raw jobs, listings)."""
+    linkedin_jobs, listings = fetch_listings(params, timeout)
+    stored_params = {k: v for k, v in params.items() if k != "api_key"}
+    job_store.ingest(search_cache_key(params), stored_params, linkedin_jobs, listings)
+    return linkedin_jobs, listings
+
+def fetch_jobs(params, timeout=None):
+    """Answer a search from the job store when fresh, otherwise from LinkedIn."""
+    stored = job_store.get_fresh(search_cache_key(params))
+    if stored is not None:
+        return stored
+    linkedin_jobs, _ = fetch_and_ingest(params, timeout)
+    return linkedin_jobs
+
+def refresh_stored_query(params):
+    """Refresher callback: repeat a stored query with the API key restored.
+
+    The refresher indexes the result itself, so this only fetches.
+    """
+    return fetch_listings({**params, "api_key": API_KEY})
+
+job_store.start_refresher(refresh_stored_query)
+
+@app.route('/api/admin/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify({"search": search_cache.stats()})
+
 @app.route('/api/search-jobs', methods=['POST'])
 def search_jobs():
     try:
         # Get search filters from request
         filters = request.json
         
-        # Extract filter values
-        position = filters.get('position', '')
-        company = filters.get('company', '')
         location = filters.get('location', '').lower() if filters.get('location') else ''
         experience_range = filters.get('experience', [0, 10])
-        work_location_type = filters.get('workLocationType', '')
-        job_type = filters.get('jobType', '')
-        
-        # Map experience range to LinkedIn experience level
-        exp_level = None
-        if experience_range:
-            min_exp, max_exp = experience_range
-            if max_exp <= 2:
-                exp_level = "1"  # Entry level
-            elif max_exp <= 5:
-                exp_level = "2"  # Associate
-            elif max_exp <= 10:
-                exp_level = "3"  # Mid-Senior level
-            else:
-                exp_level = "4"  # Director and above
-        
-        # Convert location to geoId
-        geo_id = None
-        for key, value in LOCATION_MAPPING.items():
-            if key in location:
-                geo_id = value
-                break
-        
-        # Configure LinkedIn API parameters
-        params = {
-            "api_key": API_KEY,
-            "field": position,  # Job position/title
-            "geoid": geo_id,  # Location ID
-            "page": 1,  # First page of results
-            "sortBy": "R",  # Sort by relevance
-            "jobType": JOB_TYPE_MAPPING.get(job_type),  # Job type
-            "expLevel": exp_level,  # Experience level
-            "workType": WORK_LOCATION_MAPPING.get(work_location_type),  # Remote/Onsite/Hybrid
-            "filterByCompany": company if company else None  # Company filter
-        }
-        
-        # Remove None values from parameters
-        params = {k: v for k, v in params.items() if v is not None}
-        
-        # Call LinkedIn API
-        response = requests.get(LINKEDIN_API_URL, params=params)
+        try:
+            page, seen_ids = decode_cursor(filters.get('cursor'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        position = filters.get('position', '')
+        params = linkedin_search_params(filters, page)
         
-        if response.status_code == 200:
-            linkedin_jobs = response.json()
-            print(linkedin_jobs)
+        # Call LinkedIn API, or reuse a cached or stored response for the same filters
+        cache_key = search_cache_key(params)
+        job_store.record_hit(cache_key)
+        try:
+            # Refreshing a stale entry must reach LinkedIn: a store row can be
+            # older than the cache entry it would replace
+            linkedin_jobs = search_cache.get_or_fetch(
+                cache_key, lambda: fetch_jobs(params), refresh=lambda: fetch_and_ingest(params)[0]
+            )
+        except (UpstreamError, requests.RequestException) as e:
+            # Serve matching jobs from the local index while LinkedIn is unavailable
+            stored_jobs, _ = job_store.search(text=position, location=location)
+            if stored_jobs:
+                print(f"LinkedIn unavailable ({e}), serving {len(stored_jobs)} stored jobs.")
+                return json_response({
+                    "jobs": transform_linkedin_jobs(stored_jobs, experience_range),
+                    "nextCursor": None,
+                    "offline": True
+                })
+            if isinstance(e, UpstreamError):
+                return jsonify({
+                    "error": f"LinkedIn API request failed: {e.status_code}",
+                    "message": e.text
+                }), 500
+            raise
 
-            # Transform LinkedIn jobs to match your frontend JobListing format
-            transformed_jobs = transform_linkedin_jobs(linkedin_jobs, experience_range)
-            
-            return jsonify({"jobs": transformed_jobs})
-        else:
-            return jsonify({
-                "error": f"LinkedIn API request failed: {response.status_code}",
-                "message": response.text
-            }), 500
+        # Warm the next page while the user reads this one
+        if linkedin_jobs:
+            next_params = {**params, "page": page + 1}
+            search_cache.prefetch(search_cache_key(next_params), lambda: fetch_jobs(next_params))
+
+        # Transform LinkedIn jobs to match your frontend JobListing format,
+        # dropping jobs already returned on earlier pages
+        seen = set(seen_ids)
+        transformed_jobs = transform_linkedin_jobs(linkedin_jobs, experience_range, seen)
+
+        next_cursor = None
+        if linkedin_jobs:
+            new_ids = [str(job["id"]) for job in transformed_jobs if str(job["id"]) in seen]
+            next_cursor = encode_cursor(page + 1, seen_ids + new_ids)
+
+        return json_response({"jobs": transformed_jobs, "nextCursor": next_cursor})
             
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/search-jobs/bulk', methods=['POST'])
+def search_jobs_bulk():
+    """Run several job searches at once and merge their listings.
+
+    Expects {"queries": [filters, ...]} with the same filters as
+    /api/search-jobs. Listings are de-duplicated across queries, keeping
+    the first query's copy, and each query reports its own timing.
+    """
+    try:
+        queries = (request.json or {}).get('queries')
+        if not isinstance(queries, list) or not queries:
+            return jsonify({"error": "queries must be a non-empty list of filter sets"}), 400
+        if len(queries) > BULK_SEARCH_MAX_QUERIES:
+            return jsonify({"error": f"At most {BULK_SEARCH_MAX_QUERIES} queries per request"}), 400
+        if not all(isinstance(filters, dict) for filters in queries):
+            return jsonify({"error": "Each query must be an object of search filters"}), 400
+
+        # Every query bounds its own slot wait and upstream call, so waiting
+        # for all of them can't hang and leaves nothing running behind
+        timer = StageTimer()
+        with timer.stage("search"):
+            futures = [executor.submit(run_bulk_query, filters) for filters in queries]
+            results = [future.result() for future in futures]
+
+        with timer.stage("merge"):
+            seen = set()
+            jobs = []
+            summaries = []
+            for index, (filters, result) in enumerate(zip(queries, results)):
+                summary = {"index": index, "durationMs": result.get("durationMs")}
+                if "error" in result:
+                    summary["error"] = result["error"]
+                else:
+                    listings = transform_linkedin_jobs(result["jobs"], filters.get('experience', [0, 10]), seen)
+                    jobs.extend(listings)
+                    summary["count"] = len(result["jobs"])
+                    summary["unique"] = len(listings)
+                summaries.append(summary)
+
+        response = json_response({"jobs": jobs, "queries": summaries})
+        response.headers["Server-Timing"] = timer.server_timing()
+        return response
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+def fetch_jobs_with_slot(params):
+    """fetch_jobs once one of the bulk endpoint's upstream call slots is free.
+
+    The wait for a slot is bounded, and the call's timeout only starts once
+    the slot is held, so queued queries get the same budget as the first.
+    """
+    if not bulk_search_slots.acquire(timeout=BULK_SEARCH_SLOT_WAIT_SECONDS):
+        raise TimeoutError("Timed out waiting for a free LinkedIn call slot")
+    try:
+        return fetch_jobs(params, timeout=PIPELINE_CALL_TIMEOUT_SECONDS)
+    finally:
+        bulk_search_slots.release()
+
+def run_bulk_query(filters):
+    """One bulk search query: raw LinkedIn jobs, or an error, with its duration."""
+    start = time.perf_counter()
+    try:
+        params = linkedin_search_params(filters)
+        cache_key = search_cache_key(params)
+        job_store.record_hit(cache_key)
+        # Cache hits and coalesced calls don't take an upstream slot
+        linkedin_jobs = search_cache.get_or_fetch(
+            cache_key, lambda: fetch_jobs_with_slot(params), refresh=lambda: fetch_and_ingest(params)[0]
+        )
+        result = {"jobs": linkedin_jobs}
+    except UpstreamError as e:
+        result = {"error": f"LinkedIn API request failed: {e.status_code}"}
+    except Exception as e:
+        result = {"error": str(e)}
+    result["durationMs"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+@app.route('/api/search-jobs/local', methods=['POST'])
+def search_jobs_local():
+    """Full-text and faceted search over the locally indexed jobs."""
+    try:
+        filters = request.json or {}
+        try:
+            limit = int(filters.get('limit', 50))
+        except (TypeError, ValueError):
+            return jsonify({"error": "limit must be an integer"}), 400
+        stored_jobs, facets = job_store.search(
+            text=filters.get('q', ''),
+            job_type=filters.get('jobType'),
+            location_type=filters.get('locationType'),
+            location=filters.get('location'),
+            posted_after=filters.get('postedAfter'),
+            limit=max(1, min(limit, 200))
+        )
+        experience_range = filters.get('experience', [0, 10])
+        return json_response({
+            "jobs": transform_linkedin_jobs(stored_jobs, experience_range),
+            "facets": facets
+        })
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # def transform_linkedin_jobs(linkedin_jobs, experience_range):
 #     """Transform LinkedIn API jobs to match frontend JobListing format"""
 #     transformed_jobs = []
@@ -211,49 +433,6 @@ def search_jobs():
         
 #     return transformed_jobs
 
-def transform_linkedin_jobs(linkedin_jobs, experience_range):
-    transformed_jobs = []
-
-    for i, job in enumerate(linkedin_jobs):
-        job_id = job.get('job_id', f'job-{i+1}')
-        title = job.get('job_position') or 'Unknown Role'
-        company = job.get('company_name') or 'Unknown Company'
-        location = job.get('job_location') or 'Unknown Location'
-
-        job_type = "Full-time"
-        location_type = "On-site"
-
-        salary = None
-        description = f"Exciting opportunity for a {title} role at {company}."
-
-        # Handle posting date formatting
-        raw_posted = job.get('job_posting_date')
-        try:
-            date_obj = datetime.strptime(raw_posted, "%Y-%m-%d")
-            posted_date = date_obj.isoformat()
-        except:
-            posted_date = datetime.now().isoformat()
-
-        apply_url = job.get('job_link', '#')
-
-        transformed_job = {
-            "id": job_id,
-            "title": title,
-            "company": company,
-            "location": location,
-            "jobType": job_type,
-            "locationType": location_type,
-            "salary": salary,
-            "description": description,
-            "requirements": f"{experience_range[0]}-{experience_range[1]} years of experience",
-            "postedDate": posted_date,
-            "applyUrl": apply_url
-        }
-
-        transformed_jobs.append(transformed_job)
-
-    return transformed_jobs
-
 if __name__ == '__main__':
     # Get port from environment variable or use 5000 as default
     port = int(os.environ.get('PORT', 5000))
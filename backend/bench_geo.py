@@ -0,0 +1,77 @@
+"""Benchmark geoId resolution: the old linear substring scan vs GeoResolver.
+
+Resolves a realistic mix of location strings against the shipped data
+file, padded with synthetic places to show how each approach scales with
+the number of known geoIds.
+
+Usage: python bench_geo.py [lookups] [synthetic_places]
+"""
+import json
+import random
+import sys
+import time
+from geo import GEO_DATA_PATH, GEO_LEVEL_PRIORITY, GeoResolver
+
+LOCATIONS = [
+    "Bangalore", "Bengaluru, Karnataka, India", "New Delhi", "Delhi NCR", "Mumbai, Maharashtra",
+    "Hyderabad, Telangana, India", "Remote", "remote - india", "Pune", "Gurugram, Haryana",
+    "San Francisco Bay Area", "New York City Metropolitan Area", "Chennai", "Kochi, Kerala",
+    "Banglore", "Hydrabad", "Noida", "", "Anywhere", "Thiruvananthapuram", "Indore, Madhya Pradesh",
+]
+
+
+# Locations naming several places, and the geoId each must resolve to
+EXPECTED = {
+    "Pune, India": "102179709",
+    "New Delhi, India": "102090883",
+    "Remote, India": "102713980",
+    "remote - india": "102713980",
+    "Remote": "103644278",
+}
+
+
+def linear_resolve(mapping, location):
+    """The original search_jobs lookup: first key contained in the location wins."""
+    geo_id = None
+    for key, value in mapping.items():
+        if key in location:
+            geo_id = value
+            break
+    return geo_id
+
+
+def timed(label, resolve, queries):
+    start = time.perf_counter()
+    for query in queries:
+        resolve(query)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {len(queries)} lookups  {elapsed * 1000:8.1f} ms  {elapsed / len(queries) * 1e6:7.2f} us/lookup")
+
+
+if __name__ == '__main__':
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    synthetic = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    with open(GEO_DATA_PATH, encoding="utf-8") as f:
+        records = json.load(f)
+    records += [{"name": f"synthetic town {i}", "geoId": str(900000000 + i)} for i in range(synthetic)]
+
+    mapping = {record["name"]: record["geoId"] for record in records}
+    mapping[""] = None
+    entries = [(alias, record["geoId"], GEO_LEVEL_PRIORITY[record.get("level", "city")]) for record in records
+               for alias in [record["name"], *record.get("aliases", [])]]
+
+    start = time.perf_counter()
+    resolver = GeoResolver(entries)
+    print(f"index build: {len(resolver)} names in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for location, expected in EXPECTED.items():
+        assert resolver.resolve(location) == expected, f"{location!r} resolved to {resolver.resolve(location)}"
+    print(f"resolution checks: {len(EXPECTED)} passed")
+
+    rng = random.Random(7)
+    queries = [rng.choice(LOCATIONS) for _ in range(lookups)]
+    timed("linear scan", lambda q: linear_resolve(mapping, q.lower()), queries)
+    # Bypass the per-string cache to time the automaton itself
+    timed("resolver (uncached)", resolver._resolve, queries)
+    timed("resolver (cached)", resolver.resolve, queries)
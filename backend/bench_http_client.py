@@ -0,0 +1,63 @@
+"""Microbenchmark: bare requests.get vs the pooled keep-alive client.
+
+Runs a local HTTP/1.1 stub server and counts the TCP connections each
+client opens. The stub is plain HTTP on loopback, so the savings shown are
+a lower bound; against the real providers every avoided connection also
+skips a TLS handshake and a network round-trip or two.
+
+Usage: python bench_http_client.py [requests]
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+import http_client
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment so delayed ACKs don't skew timings
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def run(label, get, url, count, server):
+    server.connections = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        get(url).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} requests={count:<5} connections={server.connections:<5} "
+          f"total={elapsed * 1000:8.1f} ms  per-request={elapsed / count * 1e6:8.1f} us")
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server = CountingServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/linkedinjobs"
+
+    run("bare", lambda u: requests.get(u, timeout=5), url, count, server)
+    run("pooled", http_client.get, url, count, server)
+    server.shutdown()
@@ -0,0 +1,59 @@
+"""Benchmark multi-page OCR latency against a stub Mistral client.
+
+The stub sleeps for a fixed request overhead plus a per-page cost, so the
+numbers show how chunked concurrent OCR scales with page count compared to
+a single whole-document request.
+
+Usage: python bench_ocr_pages.py [overhead_ms] [per_page_ms]
+"""
+import io
+import sys
+import time
+from types import SimpleNamespace
+import ocr
+
+
+class StubMistral:
+    def __init__(self, page_count, overhead, per_page):
+        self.page_count = page_count
+        self.overhead = overhead
+        self.per_page = per_page
+        self.files = SimpleNamespace(
+            upload=lambda file, purpose: SimpleNamespace(id="file-1"),
+            get_signed_url=lambda file_id: SimpleNamespace(url="https://example.invalid/doc.pdf")
+        )
+        self.ocr = SimpleNamespace(process=self.process)
+
+    def process(self, model, document, pages=None, include_image_base64=None):
+        pages = pages if pages is not None else range(self.page_count)
+        if any(page >= self.page_count for page in pages):
+            # Like the real API, a range past the last page is rejected
+            raise ValueError(f"Document has only {self.page_count} pages")
+        time.sleep(self.overhead + self.per_page * len(pages))
+        return SimpleNamespace(pages=[SimpleNamespace(markdown=f"page {i}\n" * 200) for i in pages])
+
+
+def fake_pdf(page_count):
+    return io.BytesIO(b"%PDF-1.4\n" + b"<< /Type /Page >>\n" * page_count + b"%%EOF")
+
+
+def run(page_count, chunk_size, overhead, per_page):
+    ocr.OCR_PAGES_PER_CHUNK = chunk_size
+    client = StubMistral(page_count, overhead, per_page)
+    start = time.perf_counter()
+    pages = sum(1 for _ in ocr.iter_ocr_pages(client, fake_pdf(page_count), "bench.pdf"))
+    assert pages == page_count
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    overhead = (float(sys.argv[1]) if len(sys.argv) > 1 else 500) / 1000
+    per_page = (float(sys.argv[2]) if len(sys.argv) > 2 else 150) / 1000
+    chunk_size = ocr.OCR_PAGES_PER_CHUNK
+
+    print(f"{'pages':>5} {'single (s)':>11} {'chunked (s)':>12}")
+    for page_count in (1, 5, 10, 20, 40):
+        # A chunk size above the page count forces the single-request path
+        single = run(page_count, page_count + 1, overhead, per_page)
+        chunked = run(page_count, chunk_size, overhead, per_page)
+        print(f"{page_count:>5} {single:>11.2f} {chunked:>12.2f}")
@@ -0,0 +1,103 @@
+"""Compare tiered PII redaction against the full NER pass for accuracy and latency.
+
+The full mode is treated as the reference. For every document the harness
+reports which reference entities the tiered mode missed or added, then
+prints per-entity recall/precision and p50/p99 latency for both modes.
+
+Usage: python bench_tiered_redaction.py [corpus_dir]
+
+corpus_dir holds .txt/.md resume texts (e.g. saved OCR markdown); without it
+a small built-in sample is used.
+"""
+import os
+import sys
+import time
+from collections import Counter
+from bench_redaction import SAMPLE_RESUME, percentile
+from redaction import analyze_pii
+
+BUILTIN_CORPUS = [
+    SAMPLE_RESUME,
+    """Rahul Verma
+Pune, Maharashtra | rahul.v@mail.com | (020) 555-0143
+
+Summary
+Full-stack developer with 4 years of React and Django experience.
+Referee: Anita Desai, Engineering Manager, anita.desai@corp.example
+""",
+    """# ANJALI MENON
+anjali.menon@example.org
+Phone: +1 415 555 0199
+
+Skills: Kubernetes, Terraform, AWS, Go
+Previously worked with John Smith on the payments platform.
+""",
+]
+
+
+def load_corpus(corpus_dir):
+    """(name, text) pairs for the resume texts in corpus_dir."""
+    documents = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith((".txt", ".md")):
+            with open(os.path.join(corpus_dir, name), encoding="utf-8") as f:
+                documents.append((name, f.read()))
+    return documents
+
+
+def spans(results):
+    return {(result.entity_type, result.start, result.end) for result in results}
+
+
+def describe(text, span):
+    entity_type, start, end = span
+    return f"{entity_type} {text[start:end]!r} at {start}"
+
+
+def timed_analyze(text, mode):
+    start = time.perf_counter()
+    results = analyze_pii(text, mode=mode)
+    return spans(results), time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    corpus = (load_corpus(sys.argv[1]) if len(sys.argv) > 1
+              else [(f"sample {index + 1}", text) for index, text in enumerate(BUILTIN_CORPUS)])
+    latencies = {"full": [], "tiered": []}
+    reference_counts, found_counts, extra_counts = Counter(), Counter(), Counter()
+
+    for name, text in corpus:
+        reference, full_seconds = timed_analyze(text, "full")
+        tiered, tiered_seconds = timed_analyze(text, "tiered")
+        latencies["full"].append(full_seconds)
+        latencies["tiered"].append(tiered_seconds)
+
+        missed = sorted(reference - tiered, key=lambda span: span[1])
+        extra = sorted(tiered - reference, key=lambda span: span[1])
+        print(f"{name}: {len(reference)} reference, {len(missed)} missed, {len(extra)} extra")
+        for span in missed:
+            print(f"  missed {describe(text, span)}")
+        for span in extra:
+            print(f"  extra  {describe(text, span)}")
+
+        for entity_type, _, _ in reference:
+            reference_counts[entity_type] += 1
+        for entity_type, _, _ in reference & tiered:
+            found_counts[entity_type] += 1
+        for entity_type, _, _ in tiered - reference:
+            extra_counts[entity_type] += 1
+
+    print()
+    print(f"{'entity':<20} {'reference':>9} {'recall':>8} {'precision':>9} {'extra':>6}")
+    for entity_type in sorted(set(reference_counts) | set(extra_counts)):
+        total = reference_counts[entity_type]
+        found = found_counts[entity_type]
+        recall = found / total if total else 1.0
+        reported = found + extra_counts[entity_type]
+        precision = found / reported if reported else 1.0
+        print(f"{entity_type:<20} {total:>9} {recall:>8.1%} {precision:>9.1%} {extra_counts[entity_type]:>6}")
+
+    print()
+    for mode, samples in latencies.items():
+        print(f"{mode:<8} docs={len(samples):<4} p50={percentile(samples, 50) * 1000:8.1f} ms"
+              f"  p99={percentile(samples, 99) * 1000:8.1f} ms")
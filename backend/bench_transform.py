@@ -0,0 +1,103 @@
+"""Benchmark the search-jobs response path: the old per-row transform and
+stdlib encoder vs the column transform and orjson.
+
+The stdlib encoder is called with the settings jsonify uses outside debug
+mode, and both paths are checked to produce the same bytes.
+
+Usage: python bench_transform.py [rows] [repeats]
+"""
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+import orjson
+from job_transform import transform_linkedin_jobs
+
+
+def legacy_transform(linkedin_jobs, experience_range):
+    """The original transform_linkedin_jobs loop."""
+    transformed_jobs = []
+    for i, job in enumerate(linkedin_jobs):
+        job_id = job.get('job_id', f'job-{i+1}')
+        title = job.get('job_position') or 'Unknown Role'
+        company = job.get('company_name') or 'Unknown Company'
+        location = job.get('job_location') or 'Unknown Location'
+        description = f"Exciting opportunity for a {title} role at {company}."
+        raw_posted = job.get('job_posting_date')
+        try:
+            posted_date = datetime.strptime(raw_posted, "%Y-%m-%d").isoformat()
+        except:
+            posted_date = datetime.now().isoformat()
+        transformed_jobs.append({
+            "id": job_id,
+            "title": title,
+            "company": company,
+            "location": location,
+            "jobType": "Full-time",
+            "locationType": "On-site",
+            "salary": None,
+            "description": description,
+            "requirements": f"{experience_range[0]}-{experience_range[1]} years of experience",
+            "postedDate": posted_date,
+            "applyUrl": job.get('job_link', '#')
+        })
+    return transformed_jobs
+
+
+def jsonify_body(payload):
+    return (json.dumps(payload, ensure_ascii=True, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+
+def orjson_body(payload):
+    return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+
+
+def sample_jobs(rows, rng):
+    today = datetime(2025, 5, 1)
+    jobs = []
+    for i in range(rows):
+        job = {
+            "job_id": 3900000000 + i,
+            "job_position": rng.choice(["Data Analyst", "Software Engineer", "Product Manager", ""]),
+            "company_name": rng.choice(["Acme", "Globex", "Initech", None]),
+            "job_location": rng.choice(["Bengaluru, Karnataka, India", "Pune", "Remote"]),
+            "job_posting_date": (today - timedelta(days=rng.randrange(30))).strftime("%Y-%m-%d"),
+            "job_link": f"https://www.linkedin.com/jobs/view/{3900000000 + i}"
+        }
+        if i % 7 == 0:
+            del job["job_link"]
+        jobs.append(job)
+    return jobs
+
+
+def timed(label, fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<26} {elapsed * 1000:8.3f} ms/request")
+    return elapsed
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    jobs = sample_jobs(rows, random.Random(7))
+    experience = [2, 5]
+
+    old = jsonify_body({"jobs": legacy_transform(jobs, experience), "nextCursor": None})
+    new = orjson_body({"jobs": transform_linkedin_jobs(jobs, experience), "nextCursor": None})
+    assert old == new, "response bodies differ"
+    print(f"{rows} rows, {len(new)} byte body, identical output")
+
+    timed("transform (per-row)", lambda: legacy_transform(jobs, experience), repeats)
+    timed("transform (columns)", lambda: transform_linkedin_jobs(jobs, experience), repeats)
+    listings = {"jobs": transform_linkedin_jobs(jobs, experience), "nextCursor": None}
+    timed("serialize (json)", lambda: jsonify_body(listings), repeats)
+    timed("serialize (orjson)", lambda: orjson_body(listings), repeats)
+    before = timed("end to end (old)",
+                   lambda: jsonify_body({"jobs": legacy_transform(jobs, experience), "nextCursor": None}), repeats)
+    after = timed("end to end (new)",
+                  lambda: orjson_body({"jobs": transform_linkedin_jobs(jobs, experience), "nextCursor": None}), repeats)
+    print(f"speedup: {before / after:.1f}x")
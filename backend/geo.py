@@ -0,0 +1,150 @@
+import difflib
+import json
+import os
+import re
+from collections import deque
+from functools import lru_cache
+
+# JSON list of {"name", "geoId", "aliases", "level"} records; may hold thousands of entries
+GEO_DATA_PATH = os.getenv("GEO_DATA_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "geo_ids.json"))
+# Minimum difflib similarity for a misspelled location to resolve
+GEO_FUZZY_CUTOFF = float(os.getenv("GEO_FUZZY_CUTOFF", "0.85"))
+
+# Preference between matches that don't overlap: the most specific place
+# wins, so "Pune, India" is Pune, and "remote" only when no place is named.
+# Records without a level are cities.
+GEO_LEVEL_PRIORITY = {"remote": -1, "country": 0, "state": 1, "city": 2}
+GEO_CACHE_SIZE = 4096
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_location(text):
+    """Lower-case the text and collapse punctuation and whitespace to single spaces."""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+class GeoResolver:
+    """Resolve free-text locations to LinkedIn geoIds.
+
+    Names and aliases are compiled once into an Aho-Corasick automaton, so a
+    lookup is a single pass over the location string whatever the number of
+    known places. Matches must fall on word boundaries. Among overlapping
+    matches the longest wins ("new delhi" over "delhi"); among the rest the
+    highest priority wins, then the earliest. When nothing matches, a fuzzy
+    match against the known names catches typos.
+
+    entries are (name, geoId) or (name, geoId, priority) tuples; priority
+    defaults to that of a city.
+    """
+
+    def __init__(self, entries):
+        # Trie nodes: transitions, failure link, and (length, priority, geoId) of
+        # every pattern ending at the node, including those reached via failure links
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        self._names = {}
+        # Names grouped by first letter and length, to narrow fuzzy matching
+        self._fuzzy_buckets = {}
+
+        for name, geo_id, *priority in entries:
+            name = normalize_location(name)
+            if name and name not in self._names:
+                self._names[name] = geo_id
+                self._fuzzy_buckets.setdefault((name[0], len(name)), []).append(name)
+                self._add(name, geo_id, priority[0] if priority else GEO_LEVEL_PRIORITY["city"])
+        self._build_failure_links()
+        # Per instance rather than on the method, so the cache doesn't keep the resolver alive
+        self.resolve = lru_cache(maxsize=GEO_CACHE_SIZE)(self._resolve)
+
+    @classmethod
+    def from_file(cls, path=GEO_DATA_PATH):
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+        return cls(
+            (alias, str(record["geoId"]), GEO_LEVEL_PRIORITY[record.get("level", "city")])
+            for record in records
+            for alias in [record["name"], *record.get("aliases", [])]
+        )
+
+    def __len__(self):
+        return len(self._names)
+
+    def _add(self, name, geo_id, priority):
+        node = 0
+        for char in name:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._outputs[node].append((len(name), priority, geo_id))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def _best_match(self, text):
+        matches = []  # (start, end, priority, geo_id)
+        node = 0
+        for end, char in enumerate(text, start=1):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if not self._outputs[node] or (end < len(text) and text[end] != " "):
+                continue
+            for length, priority, geo_id in self._outputs[node]:
+                start = end - length
+                if not start or text[start - 1] == " ":
+                    matches.append((start, end, priority, geo_id))
+        if not matches:
+            return None
+
+        # Keep the longest match of each run of overlapping matches, the earliest on ties
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        kept = []
+        group_end = -1
+        for match in matches:
+            start, end = match[0], match[1]
+            if start >= group_end:
+                kept.append(match)
+            elif end - start > kept[-1][1] - kept[-1][0]:
+                kept[-1] = match
+            group_end = max(group_end, end)
+        # Then the most specific place, the earliest on ties
+        return max(kept, key=lambda match: (match[2], -match[0]))[3]
+
+    def _fuzzy_match(self, text):
+        """Closest known name within a couple of characters' length of the text."""
+        candidates = [
+            name
+            for length in range(len(text) - 2, len(text) + 3)
+            for name in self._fuzzy_buckets.get((text[0], length), ())
+        ]
+        close = difflib.get_close_matches(text, candidates, n=1, cutoff=GEO_FUZZY_CUTOFF)
+        return self._names[close[0]] if close else None
+
+    def _resolve(self, location):
+        """Return the geoId for a location string, or None if it is unknown.
+
+        Called through the cached self.resolve.
+        """
+        text = normalize_location(location or "")
+        if not text:
+            return None
+        geo_id = self._best_match(text)
+        if geo_id is None:
+            geo_id = self._fuzzy_match(text)
+        return geo_id
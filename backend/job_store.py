@@ -0,0 +1,219 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "job_store.sqlite3")
+# Stored query results younger than this are served without calling LinkedIn
+JOB_STORE_MAX_AGE = int(os.getenv("JOB_STORE_MAX_AGE", "1800"))
+# Seconds between background refresh passes; 0 disables the refresher
+JOB_STORE_REFRESH_INTERVAL = int(os.getenv("JOB_STORE_REFRESH_INTERVAL", "300"))
+# Number of most popular queries kept fresh by the refresher
+JOB_STORE_REFRESH_TOP_N = int(os.getenv("JOB_STORE_REFRESH_TOP_N", "20"))
+# Queries and jobs not refreshed for this long are deleted
+JOB_STORE_RETENTION = int(os.getenv("JOB_STORE_RETENTION", str(7 * 24 * 3600)))
+# Seconds a worker holds its claim on a query it is refreshing
+JOB_STORE_REFRESH_LEASE = int(os.getenv("JOB_STORE_REFRESH_LEASE", "120"))
+
+FACETS = {"jobType": "job_type", "locationType": "location_type", "location": "location"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    query_key TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    results TEXT NOT NULL,
+    refreshed_at REAL NOT NULL,
+    refreshing_until REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT, company TEXT, location TEXT,
+    job_type TEXT, location_type TEXT, posted_date TEXT,
+    raw TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_job_type ON jobs (job_type);
+CREATE INDEX IF NOT EXISTS jobs_location_type ON jobs (location_type);
+CREATE INDEX IF NOT EXISTS jobs_location ON jobs (location);
+CREATE INDEX IF NOT EXISTS jobs_posted_date ON jobs (posted_date);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+-- Rows share the rowid of their jobs row, so updates and deletes are key lookups
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_text USING fts5 (title, company, location);
+"""
+
+
+def _fts_query(text):
+    """Quote each word so user input can't be read as FTS5 syntax."""
+    words = [word.replace('"', '""') for word in text.split()]
+    return " ".join(f'"{word}"' for word in words)
+
+
+class JobStore:
+    """SQLite index of LinkedIn search results.
+
+    Each upstream response is stored under its query key, so repeat
+    searches can be answered locally while fresh. Jobs with a job_id are
+    also indexed in an FTS5 table with facet columns, which backs local
+    search and offline fallback.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH, max_age=JOB_STORE_MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        # Query popularity in this worker, decayed on every refresh pass
+        self._hits = Counter()
+        self._refresher = None
+
+    def record_hit(self, query_key):
+        with self._lock:
+            self._hits[query_key] += 1
+
+    def get_fresh(self, query_key):
+        """Return the stored upstream response for a query if it is fresh, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT results FROM queries WHERE query_key = ? AND refreshed_at >= ?",
+                (query_key, time.time() - self.max_age)
+            ).fetchone()
+        return json.loads(row["results"]) if row else None
+
+    def ingest(self, query_key, params, raw_jobs, listings):
+        """Store an upstream response and index its jobs.
+
+        params are the query's LinkedIn parameters without the API key, kept
+        so the refresher can repeat the query. listings are the jobs as
+        transformed for the frontend, in the same order as raw_jobs.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (query_key, params, results, refreshed_at) VALUES (?, ?, ?, ?)",
+                (query_key, json.dumps(params), json.dumps(raw_jobs), now)
+            )
+            for raw, listing in zip(raw_jobs, listings):
+                if 'job_id' not in raw:
+                    continue
+                job_id = str(raw['job_id'])
+                # Upsert rather than replace, so the job keeps its rowid
+                self._conn.execute(
+                    "INSERT INTO jobs (job_id, title, company, location, job_type, location_type, "
+                    "posted_date, raw, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (job_id) DO UPDATE SET title = excluded.title, company = excluded.company, "
+                    "location = excluded.location, job_type = excluded.job_type, "
+                    "location_type = excluded.location_type, posted_date = excluded.posted_date, "
+                    "raw = excluded.raw, updated_at = excluded.updated_at",
+                    (job_id, listing["title"], listing["company"], listing["location"], listing["jobType"],
+                     listing["locationType"], listing["postedDate"], json.dumps(raw), now)
+                )
+                rowid = self._conn.execute("SELECT rowid FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+                self._conn.execute("DELETE FROM jobs_text WHERE rowid = ?", (rowid,))
+                self._conn.execute(
+                    "INSERT INTO jobs_text (rowid, title, company, location) VALUES (?, ?, ?, ?)",
+                    (rowid, listing["title"], listing["company"], listing["location"])
+                )
+
+    def search(self, text=None, job_type=None, location_type=None, location=None, posted_after=None, limit=50):
+        """Full-text and faceted search over indexed jobs.
+
+        Returns the matching raw upstream records, newest first, and counts
+        per value of each facet across all matches.
+        """
+        clauses, args = [], []
+        if text and text.strip():
+            clauses.append("jobs.rowid IN (SELECT rowid FROM jobs_text WHERE jobs_text MATCH ?)")
+            args.append(_fts_query(text))
+        for column, value in (("job_type", job_type), ("location_type", location_type)):
+            if value:
+                clauses.append(f"jobs.{column} = ?")
+                args.append(value)
+        if location:
+            clauses.append("jobs.location LIKE ?")
+            args.append(f"%{location}%")
+        if posted_after:
+            clauses.append("jobs.posted_date >= ?")
+            args.append(posted_after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT raw FROM jobs {where} ORDER BY posted_date DESC LIMIT ?", (*args, limit)
+            ).fetchall()
+            facets = {}
+            for facet, column in FACETS.items():
+                counts = self._conn.execute(
+                    f"SELECT {column} AS value, COUNT(*) AS count FROM jobs {where} "
+                    f"GROUP BY {column} ORDER BY count DESC LIMIT 20", args
+                ).fetchall()
+                facets[facet] = {row["value"]: row["count"] for row in counts}
+        return [json.loads(row["raw"]) for row in rows], facets
+
+    def refresh_popular(self, fetch, top_n=JOB_STORE_REFRESH_TOP_N):
+        """Re-fetch the most requested queries that are close to going stale.
+
+        fetch(params) calls LinkedIn and returns (raw_jobs, listings). Each
+        query is claimed first by taking a lease on its row with a
+        conditional update, so several workers sharing the database don't
+        refresh the same query.
+        """
+        with self._lock:
+            popular = [key for key, _ in self._hits.most_common(top_n)]
+            # Halve every count so queries that have gone cold drop out
+            self._hits = Counter({key: count // 2 for key, count in self._hits.items() if count > 1})
+
+        for query_key in popular:
+            now = time.time()
+            # Taking a lease that ends in the future is a claim no other
+            # worker can win, whatever its own staleness threshold
+            with self._lock, self._conn:
+                claimed = self._conn.execute(
+                    "UPDATE queries SET refreshing_until = ? "
+                    "WHERE query_key = ? AND refreshed_at < ? AND refreshing_until < ?",
+                    (now + JOB_STORE_REFRESH_LEASE, query_key, now - self.max_age * 0.8, now)
+                ).rowcount
+                row = self._conn.execute(
+                    "SELECT params FROM queries WHERE query_key = ?", (query_key,)
+                ).fetchone() if claimed else None
+            if row is None:
+                continue
+            params = json.loads(row["params"])
+            try:
+                raw_jobs, listings = fetch(params)
+            except Exception as e:
+                print(f"Job store refresh failed for {query_key}: {e}")
+                with self._lock, self._conn:
+                    self._conn.execute("UPDATE queries SET refreshing_until = 0 WHERE query_key = ?", (query_key,))
+                continue
+            # Replacing the query row also releases the lease
+            self.ingest(query_key, params, raw_jobs, listings)
+
+        self.evict_expired()
+
+    def evict_expired(self):
+        cutoff = time.time() - JOB_STORE_RETENTION
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM queries WHERE refreshed_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM jobs_text WHERE rowid IN (SELECT rowid FROM jobs WHERE updated_at < ?)", (cutoff,))
+            self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+
+    def start_refresher(self, fetch, interval=JOB_STORE_REFRESH_INTERVAL):
+        """Run refresh_popular every interval seconds on a daemon thread."""
+        if interval <= 0 or self._refresher is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh_popular(fetch)
+                except Exception as e:
+                    print(f"Job store refresher error: {e}")
+
+        self._refresher = threading.Thread(target=run, name="job-store-refresher", daemon=True)
+        self._refresher.start()
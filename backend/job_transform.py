@@ -0,0 +1,77 @@
+from datetime import datetime
+
+POSTED_DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_posted_dates(raw_dates):
+    """ISO timestamps for a column of LinkedIn posting dates.
+
+    Each distinct date string is parsed once, since a page of results
+    shares a handful of posting dates. Values that aren't a valid date
+    get the current time, as a single timestamp for the whole column.
+    """
+    parsed = {}
+    now = None
+    posted_dates = []
+    for raw in raw_dates:
+        value = None
+        if isinstance(raw, str):
+            if raw in parsed:
+                value = parsed[raw]
+            else:
+                try:
+                    value = datetime.strptime(raw, POSTED_DATE_FORMAT).isoformat()
+                except ValueError:
+                    pass
+                parsed[raw] = value
+        if value is None:
+            if now is None:
+                now = datetime.now().isoformat()
+            value = now
+        posted_dates.append(value)
+    return posted_dates
+
+
+def transform_linkedin_jobs(linkedin_jobs, experience_range, seen_ids=None):
+    """Transform LinkedIn API jobs to the frontend JobListing format.
+
+    When seen_ids is given, jobs whose job_id is already in it are skipped
+    and the ids of the jobs returned are added to it.
+    """
+    rows = []
+    for i, job in enumerate(linkedin_jobs):
+        if seen_ids is not None and 'job_id' in job:
+            job_id = str(job['job_id'])
+            if job_id in seen_ids:
+                continue
+            seen_ids.add(job_id)
+        rows.append((i, job))
+    if not rows:
+        return []
+
+    # Build each output field as a column, then zip the columns into rows
+    ids = [job.get('job_id', f'job-{i+1}') for i, job in rows]
+    titles = [job.get('job_position') or 'Unknown Role' for _, job in rows]
+    companies = [job.get('company_name') or 'Unknown Company' for _, job in rows]
+    locations = [job.get('job_location') or 'Unknown Location' for _, job in rows]
+    posted_dates = parse_posted_dates([job.get('job_posting_date') for _, job in rows])
+    apply_urls = [job.get('job_link', '#') for _, job in rows]
+    requirements = f"{experience_range[0]}-{experience_range[1]} years of experience"
+
+    return [
+        {
+            "id": job_id,
+            "title": title,
+            "company": company,
+            "location": location,
+            "jobType": "Full-time",
+            "locationType": "On-site",
+            "salary": None,
+            "description": f"Exciting opportunity for a {title} role at {company}.",
+            "requirements": requirements,
+            "postedDate": posted_date,
+            "applyUrl": apply_url
+        }
+        for job_id, title, company, location, posted_date, apply_url
+        in zip(ids, titles, companies, locations, posted_dates, apply_urls)
+    ]
@@ -0,0 +1,78 @@
+import json
+
+
+class JSONArrayStreamParser:
+    """Incrementally parse a JSON array of objects from streamed text chunks.
+
+    Anything before the opening "[" (prose, a ```json fence) is skipped, and
+    feed() returns each top-level object as soon as its closing brace
+    arrives. Only a "[" followed by "{" opens the array, so bracketed prose
+    like "[5]" is skipped too. Objects that fail to decode are dropped.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        # Saw a "[" and waiting for its first non-space character
+        self._bracket = False
+        self._object = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        """Consume the next chunk of text and return the objects it completed."""
+        completed = []
+        position = 0
+        # Offset in this chunk where the object being collected starts
+        start = 0 if self._depth else None
+
+        while position < len(text) and not self.finished:
+            char = text[position]
+
+            if not self.started:
+                if self._bracket and char == "{":
+                    self.started = True
+                    self._depth = 1
+                    start = position
+                elif not (self._bracket and char.isspace()):
+                    self._bracket = char == "["
+            elif self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    start = position
+                elif char == "]":
+                    self.finished = True
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._object.append(text[start:position + 1])
+                    obj = self._decode("".join(self._object))
+                    if obj is not None:
+                        completed.append(obj)
+                    self._object = []
+                    start = None
+            position += 1
+
+        if self._depth and start is not None:
+            self._object.append(text[start:])
+        return completed
+
+    @staticmethod
+    def _decode(raw):
+        try:
+            obj = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        return obj if isinstance(obj, dict) else None
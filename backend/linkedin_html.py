@@ -0,0 +1,140 @@
+import codecs
+import re
+from html.parser import HTMLParser
+
+# Elements that never get an end tag, so they don't open a nesting level
+_VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# Card class -> field of the LinkedIn jobs API record filled from its text
+_TEXT_FIELDS = {
+    "base-search-card__title": "job_position",
+    "base-search-card__subtitle": "company_name",
+    "job-search-card__location": "job_location",
+}
+
+_JOB_ID_RE = re.compile(r"(?:jobPosting:|/jobs/view/(?:[^/?]*-)?)(\d+)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _is_card(tag, attrs, classes):
+    return "base-search-card" in classes or "job-search-card" in classes or (
+        tag in ("div", "li") and "jobPosting" in (attrs.get("data-entity-urn") or "")
+    )
+
+
+class LinkedInJobCardParser(HTMLParser):
+    """Incrementally extract job cards from a LinkedIn job search page.
+
+    Cards are returned in the record format of the LinkedIn jobs API
+    (job_id, job_position, company_name, job_location, job_posting_date,
+    job_link), so they can go through transform_linkedin_jobs. feed()
+    returns each card once its closing tag arrives; cards without a title
+    are dropped.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._depth = 0
+        self._card = None
+        self._card_depth = None
+        # Field whose text is being collected, and the depth that ends it
+        self._field = None
+        self._field_depth = None
+        self._text = []
+        self._completed = []
+
+    def feed(self, text):
+        """Consume the next chunk of HTML and return the cards it completed."""
+        super().feed(text)
+        completed, self._completed = self._completed, []
+        return completed
+
+    def close(self):
+        """Flush buffered input and return any cards still open at the end of the page."""
+        super().close()
+        self._finish_card()
+        completed, self._completed = self._completed, []
+        return completed
+
+    def _finish_card(self):
+        card, self._card = self._card, None
+        self._card_depth = None
+        self._field = None
+        if card and card.get("job_position"):
+            self._completed.append(card)
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+
+        if _is_card(tag, attrs, classes) and (self._card is None or self._depth <= self._card_depth):
+            self._finish_card()
+            self._card = {}
+            self._card_depth = self._depth
+            match = _JOB_ID_RE.search(attrs.get("data-entity-urn") or "")
+            if match:
+                self._card["job_id"] = match.group(1)
+
+        if self._card is not None:
+            if tag == "a" and "base-card__full-link" in classes and attrs.get("href"):
+                self._card["job_link"] = attrs["href"]
+                match = _JOB_ID_RE.search(attrs["href"])
+                if match and "job_id" not in self._card:
+                    self._card["job_id"] = match.group(1)
+            elif tag == "time" and attrs.get("datetime"):
+                self._card["job_posting_date"] = attrs["datetime"]
+            elif self._field is None:
+                for css_class in classes:
+                    if css_class in _TEXT_FIELDS:
+                        self._field = _TEXT_FIELDS[css_class]
+                        self._field_depth = self._depth
+                        self._text = []
+                        break
+
+        if tag not in _VOID_ELEMENTS:
+            self._depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_ELEMENTS:
+            self._depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag in _VOID_ELEMENTS:
+            return
+        self._depth = max(0, self._depth - 1)
+        if self._field is not None and self._depth <= self._field_depth:
+            text = _WHITESPACE_RE.sub(" ", "".join(self._text)).strip()
+            if text:
+                self._card[self._field] = text
+            self._field = None
+        if self._card is not None and self._depth <= self._card_depth:
+            self._finish_card()
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self._text.append(data)
+
+
+def scrape_job_cards(chunks, max_jobs, encoding="utf-8"):
+    """Parse streamed page bytes until max_jobs cards are found.
+
+    Stops consuming chunks as soon as enough cards are complete, so the
+    caller can close the response without downloading the rest. Returns
+    (cards, bytes read).
+    """
+    parser = LinkedInJobCardParser()
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    cards = []
+    bytes_read = 0
+    for chunk in chunks:
+        bytes_read += len(chunk)
+        cards.extend(parser.feed(decoder.decode(chunk)))
+        if len(cards) >= max_jobs:
+            return cards[:max_jobs], bytes_read
+    cards.extend(parser.feed(decoder.decode(b"", final=True)))
+    cards.extend(parser.close())
+    return cards[:max_jobs], bytes_read
@@ -0,0 +1,162 @@
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+OCR_MODEL = "mistral-ocr-latest"
+# Documents longer than this are split into page ranges OCR'd concurrently
+OCR_PAGES_PER_CHUNK = int(os.getenv("OCR_PAGES_PER_CHUNK", "8"))
+# Upper bound on OCR requests in flight for a single document
+OCR_MAX_PARALLEL_CHUNKS = int(os.getenv("OCR_MAX_PARALLEL_CHUNKS", "4"))
+
+PAGE_SEPARATOR = "\n\n"
+
+# Page objects in an uncompressed PDF; "/Type /Pages" is the page tree node
+_PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_PDF_SCAN_CHUNK = 1024 * 1024
+_PDF_SCAN_OVERLAP = 32
+
+
+def count_pdf_pages(stream):
+    """Estimate the page count of a PDF stream, leaving it rewound.
+
+    Counts page objects chunk by chunk, so memory stays bounded. Returns None
+    when no page objects are visible, e.g. when they live in compressed
+    object streams.
+    """
+    count = 0
+    tail = b""
+    while True:
+        chunk = stream.read(_PDF_SCAN_CHUNK)
+        window = tail + chunk
+        # Matches starting in the overlap are counted with the next window
+        limit = len(window) if not chunk else max(0, len(window) - _PDF_SCAN_OVERLAP)
+        count += sum(1 for match in _PDF_PAGE_RE.finditer(window) if match.start() < limit)
+        if not chunk:
+            break
+        tail = window[limit:]
+    stream.seek(0)
+    return count or None
+
+
+def _process(client, document_url, pages=None):
+    return client.ocr.process(
+        model=OCR_MODEL,
+        document={
+            "type": "document_url",
+            "document_url": document_url,
+        },
+        pages=pages,
+        include_image_base64=False
+    )
+
+
+def _process_past_estimate(client, document_url, pages):
+    """OCR a range past the estimated page count, halving it when rejected.
+
+    Returns the pages' markdown and whether the document ends in the range.
+    """
+    try:
+        ocr_response = _process(client, document_url, pages)
+    except Exception:
+        if len(pages) == 1:
+            return [], True
+        middle = len(pages) // 2
+        head, ended = _process_past_estimate(client, document_url, pages[:middle])
+        if ended:
+            return head, True
+        tail, ended = _process_past_estimate(client, document_url, pages[middle:])
+        return head + tail, ended
+    markdowns = [page.markdown for page in ocr_response.pages or []]
+    return markdowns, len(markdowns) < len(pages)
+
+
+def iter_ocr_pages(client, stream, filename):
+    """Run a PDF stream through Mistral OCR and yield each page's markdown in order.
+
+    Short documents are OCR'd in a single request. Longer ones are split into
+    OCR_PAGES_PER_CHUNK page ranges processed concurrently, with at most
+    OCR_MAX_PARALLEL_CHUNKS in flight so only that many chunks are ever held
+    in memory; pages are yielded as soon as their chunk and all earlier ones
+    are done. The estimated page count is checked by carrying on with
+    chunks past it until one comes back short or is rejected.
+    """
+    page_count = count_pdf_pages(stream)
+
+    # Upload the stream to Mistral for OCR, without an intermediate file
+    print("Uploading to Mistral OCR...")
+    uploaded_pdf = client.files.upload(
+        file={
+            "file_name": filename,
+            "content": stream,
+        },
+        purpose="ocr"
+    )
+
+    # Get signed URL
+    print("Getting signed URL...")
+    signed_url = client.files.get_signed_url(file_id=uploaded_pdf.id)
+
+    if not page_count or page_count <= OCR_PAGES_PER_CHUNK:
+        print("Sending to OCR model...")
+        ocr_response = _process(client, signed_url.url)
+        print(f"OCR response received: {len(ocr_response.pages or [])} page(s).")
+        for page in ocr_response.pages or []:
+            yield page.markdown
+        return
+
+    chunks = deque(
+        list(range(start, min(start + OCR_PAGES_PER_CHUNK, page_count)))
+        for start in range(0, page_count, OCR_PAGES_PER_CHUNK)
+    )
+    print(f"Sending {page_count} pages to OCR model in {len(chunks)} chunks...")
+    yielded = 0
+    next_start = page_count
+    with ThreadPoolExecutor(max_workers=OCR_MAX_PARALLEL_CHUNKS) as executor:
+        in_flight = deque()  # (requested pages, future)
+        try:
+            while True:
+                while len(in_flight) < OCR_MAX_PARALLEL_CHUNKS:
+                    if chunks:
+                        pages = chunks.popleft()
+                        future = executor.submit(_process, client, signed_url.url, pages)
+                    elif all(requested[0] < page_count for requested, _ in in_flight):
+                        # The page count is only an estimate, so keep asking for
+                        # pages past it, one range at a time, until a range comes
+                        # back short or is rejected. The first range is a single
+                        # page, so an accurate estimate costs one small request.
+                        size = 1 if next_start == page_count else OCR_PAGES_PER_CHUNK
+                        pages = list(range(next_start, next_start + size))
+                        next_start += size
+                        future = executor.submit(_process_past_estimate, client, signed_url.url, pages)
+                    else:
+                        break
+                    in_flight.append((pages, future))
+
+                pages, future = in_flight.popleft()
+                if pages[0] < page_count:
+                    markdowns = [page.markdown for page in future.result().pages or []]
+                    ended = len(markdowns) < len(pages)
+                else:
+                    markdowns, ended = future.result()
+                for markdown in markdowns:
+                    yield markdown
+                    yielded += 1
+                if ended:
+                    break
+        except Exception as e:
+            # A range within the estimate was rejected; finish with one
+            # whole-document request instead.
+            print(f"Chunked OCR failed after {yielded} page(s), falling back to a single request: {e}")
+            for _, future in in_flight:
+                future.cancel()
+            ocr_response = _process(client, signed_url.url)
+            for page in (ocr_response.pages or [])[yielded:]:
+                yield page.markdown
+            return
+        finally:
+            # Stop early if the consumer does, or once the document has
+            # ended, without waiting on queued chunks
+            for _, future in in_flight:
+                future.cancel()
+    print(f"OCR response received: {yielded} page(s).")
@@ -0,0 +1,95 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from cachetools import TTLCache
+
+# Cache settings. Entries hold raw OCR text, which still contains PII, so keep
+# the TTL short and the SQLite file out of shared or backed-up volumes.
+OCR_CACHE_BACKEND = os.getenv("OCR_CACHE_BACKEND", "memory")
+OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH", "ocr_cache.sqlite3")
+OCR_CACHE_TTL = int(os.getenv("OCR_CACHE_TTL", "86400"))
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "1024"))
+
+
+class NullOCRCache:
+    """Cache backend that never stores anything, used to disable caching."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, entry):
+        pass
+
+
+class MemoryOCRCache:
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries=OCR_CACHE_MAX_ENTRIES, ttl=OCR_CACHE_TTL):
+        self._entries = TTLCache(maxsize=max_entries, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+
+
+class SQLiteOCRCache:
+    """On-disk cache shared by every worker on the host, evicting least recently used entries."""
+
+    def __init__(self, path=OCR_CACHE_PATH, max_entries=OCR_CACHE_MAX_ENTRIES, ttl=OCR_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_cache ("
+                "key TEXT PRIMARY KEY, entry TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ocr_cache_accessed ON ocr_cache (accessed_at)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT entry FROM ocr_cache WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE ocr_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, entry):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr_cache (key, entry, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry), now, now)
+            )
+            # Drop expired entries, then trim to the size bound by recency
+            self._conn.execute("DELETE FROM ocr_cache WHERE created_at < ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM ocr_cache WHERE key NOT IN "
+                "(SELECT key FROM ocr_cache ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+
+def create_ocr_cache(backend=OCR_CACHE_BACKEND):
+    """Build the OCR cache backend selected by OCR_CACHE_BACKEND."""
+    if backend == "memory":
+        return MemoryOCRCache()
+    if backend == "sqlite":
+        return SQLiteOCRCache()
+    if backend == "none":
+        return NullOCRCache()
+    raise ValueError(f"Unknown OCR_CACHE_BACKEND '{backend}', expected memory, sqlite or none")
@@ -0,0 +1,118 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
+# Shared worker pool for fanning out provider calls from request threads
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "16"))
+# Whole-request budget and per-call budget for fanned-out provider calls
+PIPELINE_DEADLINE_SECONDS = float(os.getenv("PIPELINE_DEADLINE_SECONDS", "45"))
+PIPELINE_CALL_TIMEOUT_SECONDS = float(os.getenv("PIPELINE_CALL_TIMEOUT_SECONDS", "20"))
+
+# Module-level so slow calls that miss their deadline never block a request
+# on executor shutdown; they finish in the background and are discarded.
+executor = ThreadPoolExecutor(max_workers=PIPELINE_MAX_WORKERS, thread_name_prefix="pipeline")
+
+
+class StageTimer:
+    """Wall-clock time per pipeline stage, rendered as a Server-Timing header."""
+
+    def __init__(self, deadline_seconds=PIPELINE_DEADLINE_SECONDS):
+        self.started = time.perf_counter()
+        self.deadline = self.started + deadline_seconds
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def remaining(self):
+        """Seconds left before the request deadline, never negative."""
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def server_timing(self):
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages]
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+def _outcome(future):
+    try:
+        return future.result()
+    except Exception as e:
+        return {"error": f"Exception occurred: {str(e)}"}
+
+
+class FanOut:
+    """Calls to fn submitted one item at a time, with results collected as they finish.
+
+    Each call gets call_timeout seconds from its submission, capped by what
+    is left of the timer's deadline. Calls still running after that, or that
+    raise, are reported as {"error": ...} so the caller can still return
+    partial results. Results are (index, result, timed_out) tuples, where
+    index is the item's submission order.
+    """
+
+    def __init__(self, fn, timer, call_timeout=PIPELINE_CALL_TIMEOUT_SECONDS):
+        self.fn = fn
+        self.timer = timer
+        self.call_timeout = call_timeout
+        self._futures = {}
+        self._pending = set()
+        self._deadlines = {}  # future -> perf_counter time its call times out
+
+    def submit(self, item):
+        """Start fn(item) in the background and return its index."""
+        index = len(self._futures)
+        future = executor.submit(self.fn, item)
+        self._futures[future] = index
+        self._pending.add(future)
+        self._deadlines[future] = time.perf_counter() + self.call_timeout
+        return index
+
+    def ready(self):
+        """Yield results of calls that have already finished, without waiting."""
+        for future in [f for f in self._pending if f.done()]:
+            self._pending.discard(future)
+            yield self._futures[future], _outcome(future), False
+
+    def drain(self):
+        """Yield the remaining results as they finish, each until its own deadline."""
+        while self._pending:
+            request_deadline = time.perf_counter() + self.timer.remaining()
+            deadline = min(min(self._deadlines[future] for future in self._pending), request_deadline)
+            done, _ = wait(self._pending, timeout=max(0.0, deadline - time.perf_counter()),
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                self._pending.discard(future)
+                yield self._futures[future], _outcome(future), False
+
+            now = time.perf_counter()
+            for future in [f for f in self._pending if min(self._deadlines[f], request_deadline) <= now]:
+                self._pending.discard(future)
+                future.cancel()
+                yield self._futures[future], {"error": "Timed out waiting for provider response"}, True
+
+
+def bounded_map(fn, items, limit):
+    """Call fn(item) for every item on the shared executor, at most limit at a time.
+
+    Returns the results in input order. fn should handle its own errors;
+    an exception from any call is re-raised once it finishes.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    running = {}
+    position = 0
+    while position < len(items) or running:
+        while position < len(items) and len(running) < max(1, limit):
+            running[executor.submit(fn, items[position])] = position
+            position += 1
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            results[running.pop(future)] = future.result()
+    return results
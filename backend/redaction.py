@@ -0,0 +1,187 @@
+import os
+import queue
+from contextlib import contextmanager
+from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine
+from presidio_analyzer.predefined_recognizers import (
+    CreditCardRecognizer, EmailRecognizer, PhoneRecognizer, UsBankRecognizer,
+    UsLicenseRecognizer, UsPassportRecognizer, UsSsnRecognizer
+)
+from presidio_anonymizer import AnonymizerEngine
+
+# Entities we want to mask
+SENSITIVE_ENTITIES = ["NAME", "PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "CREDIT_CARD", "US_SSN",
+                      "US_BANK_NUMBER", "US_DRIVER_LICENSE", "US_PASSPORT"]
+
+# Entities that only the spaCy NER model can find
+NER_ENTITIES = ["NAME", "PERSON"]
+
+# "full" runs every recognizer, including NER, over the whole document.
+# "tiered" finds structured entities with pattern recognizers only and runs
+# NER just over the header block, where resumes put the candidate's name.
+REDACTION_MODES = ("full", "tiered")
+PII_REDACTION_MODE = os.getenv("PII_REDACTION_MODE", "full")
+
+# Number of non-blank lines at the top of a resume treated as the header block
+PII_NAME_HEADER_LINES = int(os.getenv("PII_NAME_HEADER_LINES", "5"))
+
+# Each analyzer holds its own copy of en_core_web_lg (~600 MB), so size the pool
+# to the number of request threads per worker rather than to the CPU count.
+PII_ANALYZER_POOL_SIZE = int(os.getenv("PII_ANALYZER_POOL_SIZE", "2"))
+
+# Bulk redaction settings, passed through to spaCy's nlp.pipe
+PII_BATCH_SIZE = int(os.getenv("PII_BATCH_SIZE", "32"))
+PII_N_PROCESS = int(os.getenv("PII_N_PROCESS", "1"))
+
+
+class AnalyzerPool:
+    """Fixed-size pool of warm presidio analyzers shared across request threads."""
+
+    def __init__(self, size, factory=AnalyzerEngine):
+        if size < 1:
+            raise ValueError("Analyzer pool size must be at least 1")
+        self.size = size
+        self._analyzers = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._analyzers.put(factory())
+
+    @contextmanager
+    def acquire(self):
+        """Borrow an analyzer for the duration of the block, waiting if all are busy."""
+        analyzer = self._analyzers.get()
+        try:
+            yield analyzer
+        finally:
+            self._analyzers.put(analyzer)
+
+
+# Load the engines once per worker process, at import time, so no request pays
+# for spaCy model loading. The anonymizer is stateless and safe to share.
+print(f"Loading {PII_ANALYZER_POOL_SIZE} PII analyzer(s)...")
+analyzer_pool = AnalyzerPool(PII_ANALYZER_POOL_SIZE)
+anonymizer = AnonymizerEngine()
+
+# Pattern/checksum recognizers for the structured entities; none of them need
+# NLP artifacts, so they can run without touching the spaCy pipeline.
+pattern_recognizers = [
+    EmailRecognizer(), PhoneRecognizer(), CreditCardRecognizer(), UsSsnRecognizer(),
+    UsBankRecognizer(), UsLicenseRecognizer(), UsPassportRecognizer()
+]
+
+
+def _anonymize(text, analyzer_results):
+    """Mask the sensitive entities found by the analyzer in the text."""
+    # Filter only sensitive entities (a no-op for results from analyze_pii)
+    filtered_results = [result for result in analyzer_results
+                        if result.entity_type in SENSITIVE_ENTITIES]
+
+    # Anonymize the text
+    anonymized_result = anonymizer.anonymize(
+        text=text,
+        analyzer_results=filtered_results
+    )
+
+    return anonymized_result.text
+
+
+def _check_mode(mode):
+    if mode not in REDACTION_MODES:
+        raise ValueError(f"Unknown redaction mode '{mode}', expected one of {', '.join(REDACTION_MODES)}")
+
+
+def _analyze_patterns(text):
+    """Find structured PII with the pattern recognizers alone, skipping NER."""
+    results = []
+    for recognizer in pattern_recognizers:
+        results.extend(recognizer.analyze(
+            text=text,
+            entities=recognizer.supported_entities,
+            nlp_artifacts=None
+        ))
+    return results
+
+
+def _header_block(text):
+    """Return the leading lines of the text that are likely to hold names.
+
+    The block is a prefix of the text, so offsets found in it apply unchanged
+    to the whole document.
+    """
+    end = 0
+    non_blank = 0
+    for line in text.splitlines(keepends=True):
+        if non_blank >= PII_NAME_HEADER_LINES:
+            break
+        end += len(line)
+        if line.strip():
+            non_blank += 1
+    return text[:end]
+
+
+def analyze_pii(text, mode=PII_REDACTION_MODE, has_header=True):
+    """Return the analyzer results for the sensitive entities in the text.
+
+    has_header tells tiered mode whether the text starts with the resume
+    header; continuation pages are then checked with patterns alone.
+    """
+    _check_mode(mode)
+    if mode == "tiered":
+        analyzer_results = _analyze_patterns(text)
+        header = _header_block(text) if has_header else ""
+        if header.strip():
+            with analyzer_pool.acquire() as analyzer:
+                analyzer_results.extend(analyzer.analyze(text=header, language="en", entities=NER_ENTITIES))
+    else:
+        # Analyze the text for PII
+        with analyzer_pool.acquire() as analyzer:
+            analyzer_results = analyzer.analyze(text=text, language="en")
+
+    # Filter only sensitive entities
+    return [result for result in analyzer_results
+            if result.entity_type in SENSITIVE_ENTITIES]
+
+
+def redact_pii(text, mode=PII_REDACTION_MODE):
+    """Apply PII masking to the text to protect sensitive information."""
+    return _anonymize(text, analyze_pii(text, mode))
+
+
+def redact_pages(pages, mode=PII_REDACTION_MODE):
+    """Mask an iterable of page texts one page at a time, yielding each masked page.
+
+    The first page is treated as holding the resume header.
+    """
+    for index, page in enumerate(pages):
+        yield _anonymize(page, analyze_pii(page, mode, has_header=index == 0))
+
+
+def redact_pii_bulk(texts, batch_size=PII_BATCH_SIZE, n_process=PII_N_PROCESS, mode=PII_REDACTION_MODE):
+    """Apply PII masking to many texts at once, batching them through nlp.pipe.
+
+    Returns the masked texts in input order, identical to calling redact_pii
+    on each one with the same mode.
+    """
+    _check_mode(mode)
+    texts = list(texts)
+    if not texts:
+        return []
+
+    # In tiered mode only the header blocks go through the NER pipeline
+    ner_texts = [_header_block(text) for text in texts] if mode == "tiered" else texts
+    ner_kwargs = {"entities": NER_ENTITIES} if mode == "tiered" else {}
+
+    with analyzer_pool.acquire() as analyzer:
+        batch_analyzer = BatchAnalyzerEngine(analyzer_engine=analyzer)
+        results_per_text = batch_analyzer.analyze_iterator(
+            ner_texts,
+            language="en",
+            batch_size=batch_size,
+            n_process=n_process,
+            **ner_kwargs
+        )
+
+    masked_texts = []
+    for text, analyzer_results in zip(texts, results_per_text):
+        if mode == "tiered":
+            analyzer_results = analyzer_results + _analyze_patterns(text)
+        masked_texts.append(_anonymize(text, analyzer_results))
+    return masked_texts
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Background refreshes of stale entries and prefetches
+RESPONSE_CACHE_REFRESH_WORKERS = int(os.getenv("RESPONSE_CACHE_REFRESH_WORKERS", "4"))
+
+refresh_executor = ThreadPoolExecutor(max_workers=RESPONSE_CACHE_REFRESH_WORKERS, thread_name_prefix="cache-refresh")
+
+
+class UpstreamError(Exception):
+    """An upstream call returned a non-success response, which is never cached."""
+
+    def __init__(self, status_code, text):
+        super().__init__(f"Upstream request failed: {status_code}")
+        self.status_code = status_code
+        self.text = text
+
+
+class ResponseCache:
+    """LRU-bounded TTL cache for upstream responses.
+
+    Concurrent misses for the same key share one upstream call
+    (single-flight). Entries older than ttl but younger than stale_ttl are
+    served immediately while a background refresh replaces them
+    (stale-while-revalidate).
+    """
+
+    def __init__(self, max_entries, ttl, stale_ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+        self._in_flight = {}  # key -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.prefetches = 0
+        self.errors = 0
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _run_fetch(self, key, fetch, flight):
+        """Call fetch as the single in-flight call for key and publish its outcome."""
+        try:
+            value = fetch()
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            flight.set_exception(e)
+            raise
+        else:
+            self._store(key, value)
+            flight.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _refresh(self, key, fetch, flight):
+        try:
+            self._run_fetch(key, fetch, flight)
+        except Exception as e:
+            print(f"Background refresh failed for {key}: {e}")
+
+    def _start_refresh(self, key, fetch):
+        """Fetch key in the background unless a fetch is already running. Call with the lock held."""
+        if key in self._in_flight:
+            return False
+        flight = Future()
+        self._in_flight[key] = flight
+        refresh_executor.submit(self._refresh, key, fetch, flight)
+        return True
+
+    def get_or_fetch(self, key, fetch, refresh=None):
+        """Return the cached value for key, calling fetch() on a miss.
+
+        Stale entries are replaced in the background with refresh(), or
+        fetch() when not given, for callers whose fetch may itself answer
+        from a slower-expiring store.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age < self.ttl:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return value
+                if age < self.stale_ttl:
+                    self.stale_hits += 1
+                    self._entries.move_to_end(key)
+                    self.refreshes += self._start_refresh(key, refresh or fetch)
+                    return value
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                flight = Future()
+                self._in_flight[key] = flight
+                leader = True
+
+        if not leader:
+            return flight.result()
+        return self._run_fetch(key, fetch, flight)
+
+    def prefetch(self, key, fetch):
+        """Warm key in the background unless it is already fresh or being fetched."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                return
+            self.prefetches += self._start_refresh(key, fetch)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "prefetches": self.prefetches,
+                "errors": self.errors,
+                "in_flight": len(self._in_flight),
+                "hit_rate": (self.hits + self.stale_hits + self.coalesced) / lookups if lookups else 0.0
+            }
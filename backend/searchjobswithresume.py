@@ -1,19 +1,27 @@
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response, stream_with_context
 import os
 import uuid
 import json
-from tempfile import NamedTemporaryFile
-from presidio_analyzer import AnalyzerEngine
-from presidio_anonymizer import AnonymizerEngine
 import google.generativeai as genai
-import requests
 from mistralai import Mistral
 from flask_cors import CORS  # Import CORS
 from dotenv import load_dotenv
 load_dotenv()
+import http_client
+from json_stream import JSONArrayStreamParser
+from job_transform import transform_linkedin_jobs
+from linkedin_html import scrape_job_cards
+from ocr import iter_ocr_pages, PAGE_SEPARATOR
+from ocr_cache import create_ocr_cache
+from pipeline import StageTimer, FanOut, bounded_map, PIPELINE_CALL_TIMEOUT_SECONDS
+from uploads import open_upload, ResumeTooLargeError, UploadStats
+from suggestion_cache import SuggestionCache
+from redaction import redact_pii, redact_pages, redact_pii_bulk, PII_BATCH_SIZE, PII_N_PROCESS, PII_REDACTION_MODE, REDACTION_MODES  # Warm PII engines are loaded at import
 app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+CORS(app, expose_headers=["Server-Timing", "X-Resume-Bytes-Read", "X-Resume-Bytes-Copied"])  # Enable CORS for all routes
+# Reject oversized request bodies before Werkzeug spools them
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get("MAX_REQUEST_BYTES", str(256 * 1024 * 1024)))
 
 # Environment variables (replace with your actual keys in production)
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
@@ -29,32 +37,99 @@ genai.configure(api_key=GEMINI_API_KEY)
 gemini_model = genai.GenerativeModel('gemini-2.0-flash')
 print("GEMINI_API_KEY:", GEMINI_API_KEY)
 
-def redact_pii(text):
-    """Apply PII masking to the text to protect sensitive information."""
-    analyzer = AnalyzerEngine()
-    anonymizer = AnonymizerEngine()
-    
-    # Analyze the text for PII
-    analyzer_results = analyzer.analyze(text=text, language="en")
-    
-    # Entities we want to mask
-    sensitive_entities = ["NAME","PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "CREDIT_CARD", "US_SSN", 
-                          "US_BANK_NUMBER", "US_DRIVER_LICENSE", "US_PASSPORT"]
-    
-    # Filter only sensitive entities
-    filtered_results = [result for result in analyzer_results 
-                        if result.entity_type in sensitive_entities]
-    
-    # Anonymize the text
-    anonymized_result = anonymizer.anonymize(
-        text=text,
-        analyzer_results=filtered_results
-    )
-    
-    return anonymized_result.text
+# Upper bound on the number of files accepted by /api/process-resumes
+MAX_BATCH_RESUMES = int(os.environ.get("MAX_BATCH_RESUMES", "500"))
+# Resumes of one batch sent to Mistral OCR at the same time
+BATCH_OCR_CONCURRENCY = int(os.environ.get("BATCH_OCR_CONCURRENCY", "4"))
+
+# Job cards parsed from a scraped LinkedIn search page; reading stops once
+# this many are found
+LINKEDIN_SCRAPE_MAX_JOBS = int(os.environ.get("LINKEDIN_SCRAPE_MAX_JOBS", "25"))
+LINKEDIN_SCRAPE_CHUNK_BYTES = int(os.environ.get("LINKEDIN_SCRAPE_CHUNK_BYTES", str(16 * 1024)))
+
+# Years of experience shown on listings for each LinkedIn experience level
+EXPERIENCE_LEVEL_RANGES = {"1": [0, 2], "2": [3, 5], "3": [6, 10], "4": [10, 20]}
+
+# OCR (and masked text) cache keyed by the SHA-256 of the uploaded PDF bytes
+ocr_cache = create_ocr_cache()
+
+# Gemini suggestions for identical or near-duplicate masked resumes
+suggestion_cache = SuggestionCache()
+
+def get_redaction_mode():
+    """Read the per-request redaction mode from the form or query string."""
+    return request.form.get('redactionMode') or request.args.get('redactionMode') or PII_REDACTION_MODE
+
+def upload_stats():
+    """Per-request counters of resume bytes read and copied, exposed as headers."""
+    if 'upload_stats' not in g:
+        g.upload_stats = UploadStats()
+    return g.upload_stats
 
-def get_job_suggestions_from_gemini(resume_text):
-    """Get job position suggestions from Gemini based on the resume content."""
+@app.after_request
+def add_upload_stats_headers(response):
+    if 'upload_stats' in g:
+        response.headers['X-Resume-Bytes-Read'] = str(g.upload_stats.bytes_read)
+        response.headers['X-Resume-Bytes-Copied'] = str(g.upload_stats.bytes_copied)
+    return response
+
+def ocr_resume_cached(resume_file, redaction_mode=None, stats=None):
+    """OCR an upload unless the same PDF is already cached.
+
+    Returns the cache key and the cache entry, a dict with the OCR text under
+    "ocr_text" and masked texts keyed by redaction mode under "masked". On a
+    miss with a redaction_mode, pages are masked as they come back from OCR.
+    Bytes are counted on stats, or on the request's stats when not given.
+    """
+    with open_upload(resume_file, stats if stats is not None else upload_stats()) as (stream, cache_key):
+        entry = ocr_cache.get(cache_key)
+        if entry is not None:
+            print("OCR cache hit, skipping Mistral OCR.")
+            return cache_key, entry
+
+        ocr_pages = []
+
+        def collect_pages():
+            for page_markdown in iter_ocr_pages(mistral_client, stream, resume_file.filename):
+                ocr_pages.append(page_markdown)
+                yield page_markdown
+
+        masked = {}
+        if redaction_mode:
+            print("Masking PII page by page...")
+            masked[redaction_mode] = PAGE_SEPARATOR.join(redact_pages(collect_pages(), redaction_mode))
+        else:
+            for _ in collect_pages():
+                pass
+
+    if not ocr_pages:
+        return cache_key, None
+    entry = {"ocr_text": PAGE_SEPARATOR.join(ocr_pages), "masked": masked}
+    ocr_cache.set(cache_key, entry)
+    return cache_key, entry
+
+def ocr_batch_resume(resume_file):
+    """OCR one resume of a batch off the request thread.
+
+    Returns (cache key, cache entry, stats, error) so a failed file doesn't
+    fail the batch; each file counts its bytes on its own UploadStats.
+    """
+    stats = UploadStats()
+    try:
+        cache_key, cache_entry = ocr_resume_cached(resume_file, stats=stats)
+        return cache_key, cache_entry, stats, None
+    except Exception as e:
+        return None, None, stats, e
+
+def cache_masked_text(cache_key, entry, redaction_mode, masked_text):
+    """Store the masked text for a mode alongside the cached OCR text."""
+    ocr_cache.set(cache_key, {
+        "ocr_text": entry["ocr_text"],
+        "masked": {**entry["masked"], redaction_mode: masked_text}
+    })
+
+def iter_job_suggestions_from_gemini(resume_text):
+    """Stream job position suggestions from Gemini, yielding each one as soon as it is complete."""
     prompt = f"""
     Based on the following resume text, suggest 5 job positions that would be a good match for this person's skills and experience.
     For each position, provide:
@@ -66,39 +141,45 @@ def get_job_suggestions_from_gemini(resume_text):
     
     Format your response as a JSON array of objects, where each object has 'title' and 'reason' properties.
     """
-    
+
+    cached = suggestion_cache.get(resume_text)
+    if cached is not None:
+        print("Suggestion cache hit, skipping Gemini.")
+        yield from cached
+        return
+
+    # The parser skips any prose or ```json fence before the array and
+    # returns each {title, reason} object as soon as its brace closes
+    parser = JSONArrayStreamParser()
+    suggestions = []
     try:
-        response = gemini_model.generate_content(prompt)
-        
-        # Process the response text to extract valid JSON
-        response_text = response.text
-        # Find JSON content between ```json and ``` if it exists
-        if "```json" in response_text and "```" in response_text.split("```json")[1]:
-            json_content = response_text.split("```json")[1].split("```")[0].strip()
-        else:
-            # Try to find any JSON array in the text
-            import re
-            match = re.search(r'\[\s*{.*}\s*\]', response_text, re.DOTALL)
-            if match:
-                json_content = match.group(0)
-            else:
-                json_content = response_text
-        
-        try:
-            suggestions = json.loads(json_content)
-            return suggestions
-        except json.JSONDecodeError:
-            # If we can't parse JSON, create a structured response from the text
-            return [{"title": "General position based on resume", 
-                    "reason": "Could not automatically determine positions. Please review the resume manually."}]
-    
+        for chunk in gemini_model.generate_content(prompt, stream=True):
+            for suggestion in parser.feed(chunk.text):
+                suggestions.append(suggestion)
+                yield suggestion
+            if parser.finished:
+                break
     except Exception as e:
         print(f"Error getting suggestions from Gemini: {e}")
-        return [{"title": "Error processing resume", 
-                "reason": "An error occurred while analyzing the resume content."}]
+        if not suggestions:
+            yield {"title": "Error processing resume",
+                   "reason": "An error occurred while analyzing the resume content."}
+        return
+
+    if suggestions:
+        suggestion_cache.set(resume_text, suggestions)
+    else:
+        # If we can't parse JSON, create a structured response from the text
+        yield {"title": "General position based on resume",
+               "reason": "Could not automatically determine positions. Please review the resume manually."}
 
-def search_linkedin_jobs(job_title, geo_id='', sort_by='', job_type='', exp_level='', work_type='', filter_by_company=''):
-    """Search for LinkedIn jobs based on a specific job title and optional parameters."""
+def search_linkedin_jobs(job_title, geo_id='', sort_by='', job_type='', exp_level='', work_type='', filter_by_company='',
+                         max_jobs=LINKEDIN_SCRAPE_MAX_JOBS):
+    """Search for LinkedIn jobs based on a specific job title and optional parameters.
+
+    The scraped page is parsed as it streams in, and the download stops
+    once max_jobs job cards have been read.
+    """
     # Use the general scraping endpoint
     url = "https://api.scrapingdog.com/scrape"
     
@@ -131,30 +212,59 @@ def search_linkedin_jobs(job_title, geo_id='', sort_by='', job_type='', exp_leve
         print(f"Scraping URL: {linkedin_url}")
         print(f"Using ScrapingDog API: {url}")
         
-        # Make the request to ScrapingDog
-        response = requests.get(url, params=params)
-        
-        print(f"ScrapingDog Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            # For HTML responses, you'll need to parse the HTML to extract job listings
-            # This is a simplified version - you may need to use BeautifulSoup for proper parsing
-            return {
-                "status": "success",
-                "url_scraped": linkedin_url,
-                "raw_html_length": len(response.text),
-                "sample_content": response.text[:500]  # First 500 characters as sample
-            }
-        else:
-            # Return error information with full details
-            return {
-                "error": f"LinkedIn scraping failed with status code: {response.status_code}",
-                "url_used": linkedin_url,
-                "response_text": response.text[:500] if hasattr(response, 'text') else "No response text"
-            }
+        # Make the request to ScrapingDog, streaming the body
+        with http_client.get(url, params=params, timeout=PIPELINE_CALL_TIMEOUT_SECONDS, stream=True) as response:
+            print(f"ScrapingDog Status Code: {response.status_code}")
+
+            if response.status_code == 200:
+                # Pages without a declared charset are UTF-8 in practice, not
+                # the ISO-8859-1 requests assumes for text/html
+                content_type = response.headers.get("Content-Type", "").lower()
+                encoding = response.encoding if "charset" in content_type and response.encoding else "utf-8"
+                cards, bytes_read = scrape_job_cards(
+                    response.iter_content(chunk_size=LINKEDIN_SCRAPE_CHUNK_BYTES), max_jobs, encoding
+                )
+                print(f"Parsed {len(cards)} job cards from {bytes_read} bytes")
+                experience_range = EXPERIENCE_LEVEL_RANGES.get(exp_level, [0, 10])
+                return {
+                    "status": "success",
+                    "url_scraped": linkedin_url,
+                    "jobs": transform_linkedin_jobs(cards, experience_range, set()),
+                    "bytes_read": bytes_read
+                }
+            else:
+                # Return error information with full details
+                return {
+                    "error": f"LinkedIn scraping failed with status code: {response.status_code}",
+                    "url_used": linkedin_url,
+                    "response_text": response.text[:500] if hasattr(response, 'text') else "No response text"
+                }
     except Exception as e:
         return {"error": f"Exception occurred: {str(e)}"}
 
+def iter_suggestions_and_searches(masked_text, timer):
+    """Yield Gemini job suggestions and their LinkedIn searches as each becomes ready.
+
+    A LinkedIn search starts as soon as its suggestion is parsed, while
+    Gemini is still writing the rest. Yields ("suggestion", suggestion) and
+    ("linkedin", {"index", "title", "result", "timed_out"}) tuples.
+    """
+    searches = FanOut(search_linkedin_jobs, timer)
+    titles = []
+    with timer.stage("suggest"):
+        for suggestion in iter_job_suggestions_from_gemini(masked_text):
+            yield "suggestion", suggestion
+            if suggestion.get("title"):
+                titles.append(suggestion["title"])
+                searches.submit(suggestion["title"])
+            for index, result, timed_out in searches.ready():
+                yield "linkedin", {"index": index, "title": titles[index], "result": result, "timed_out": timed_out}
+
+    # Keep whatever finishes before the deadline
+    with timer.stage("linkedin"):
+        for index, result, timed_out in searches.drain():
+            yield "linkedin", {"index": index, "title": titles[index], "result": result, "timed_out": timed_out}
+
 @app.route('/api/process-resume', methods=['POST'])
 def process_resume():
     print("Received request to /api/process-resume")
@@ -166,74 +276,193 @@ def process_resume():
     if resume_file.filename == '':
         return jsonify({"error": "No resume file selected"}), 400
 
+    redaction_mode = get_redaction_mode()
+    if redaction_mode not in REDACTION_MODES:
+        return jsonify({"error": f"Invalid redactionMode, expected one of: {', '.join(REDACTION_MODES)}"}), 400
+
+    timer = StageTimer()
     try:
-        # Save the uploaded resume temporarily
-        print("Saving resume temporarily...")
-        with NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            resume_file.save(temp_file.name)
-            temp_filename = temp_file.name
-
-        # Upload file to Mistral for OCR
-        print("Uploading to Mistral OCR...")
-        with open(temp_filename, "rb") as f:
-            uploaded_pdf = mistral_client.files.upload(
-                file={
-                    "file_name": resume_file.filename,
-                    "content": f,
-                },
-                purpose="ocr"
-            )
-
-        # Get signed URL
-        print("Getting signed URL...")
-        signed_url = mistral_client.files.get_signed_url(file_id=uploaded_pdf.id)
-
-        # Process with OCR
-        print("Sending to OCR model...")
-        ocr_response = mistral_client.ocr.process(
-            model="mistral-ocr-latest",
-            document={
-                "type": "document_url",
-                "document_url": signed_url.url,
-            }
-        )
-        print(ocr_response)
-        
-        # Access the 'text' attribute of the OCR response
-        print("OCR response received.")
-        if ocr_response.pages and len(ocr_response.pages) > 0:
-            resume_text = ocr_response.pages[0].markdown
-        else:
+        with timer.stage("ocr"):
+            cache_key, cache_entry = ocr_resume_cached(resume_file, redaction_mode)
+        if cache_entry is None:
             return jsonify({"error": "OCR response does not contain any text"}), 500
+        resume_text = cache_entry["ocr_text"]
+        print(f"Resume bytes read: {upload_stats().bytes_read}, copied: {upload_stats().bytes_copied}")
 
         # Apply PII masking
-        print("Masking PII...")
-        masked_text = redact_pii(resume_text)
-
-        # Get job suggestions
-        print("Generating job suggestions...")
-        job_suggestions = get_job_suggestions_from_gemini(masked_text)
+        masked_text = cache_entry["masked"].get(redaction_mode)
+        if masked_text is None:
+            print("Masking PII...")
+            with timer.stage("mask"):
+                masked_text = redact_pii(resume_text, mode=redaction_mode)
+            cache_masked_text(cache_key, cache_entry, redaction_mode, masked_text)
 
-        # Get LinkedIn job results for the first suggestion
-        print("Searching LinkedIn jobs...")
-        linkedin_jobs = []
-        if job_suggestions:
-            first_title = job_suggestions[0]["title"]
-            linkedin_jobs = search_linkedin_jobs(first_title)
+        # Get job suggestions, searching LinkedIn for each title as it arrives
+        print("Generating job suggestions and searching LinkedIn jobs...")
+        job_suggestions = []
+        searches = []
+        for kind, payload in iter_suggestions_and_searches(masked_text, timer):
+            if kind == "suggestion":
+                job_suggestions.append(payload)
+            else:
+                searches.append(payload)
+        searches.sort(key=lambda search: search["index"])
+        timed_out = sum(search["timed_out"] for search in searches)
+        if timed_out:
+            print(f"{timed_out} LinkedIn search(es) missed the deadline.")
 
         # Return the results
         print("Returning results.")
-        return jsonify({
+        response = jsonify({
             "ocr_text": resume_text,
             "masked_text": masked_text,
             "job_suggestions": job_suggestions,
-            "linkedin_jobs": linkedin_jobs
+            # The first suggestion's results, as before, plus every title's
+            "linkedin_jobs": searches[0]["result"] if searches else [],
+            "linkedin_results": [{"title": search["title"], "result": search["result"]}
+                                 for search in searches],
+            "partial": timed_out > 0
         })
+        response.headers['Server-Timing'] = timer.server_timing()
+        return response
 
+    except ResumeTooLargeError as e:
+        return jsonify({"error": str(e)}), 413
     except Exception as e:
         print(f"Exception: {str(e)}")
         return jsonify({"error": f"Error processing resume: {str(e)}"}), 500
     
+def sse_event(event, data):
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/process-resume/stream', methods=['POST'])
+def process_resume_stream():
+    """Run the resume pipeline, streaming each stage's result as server-sent events.
+
+    Every event's data is a subset of the /api/process-resume response:
+    "ocr" carries ocr_text, "masked" masked_text, each "job_suggestion" a
+    one-element job_suggestions list, each "linkedin" one linkedin_results
+    entry (plus linkedin_jobs for the first title) and "done" the partial flag.
+    Failures end the stream with an "error" event.
+    """
+    print("Received request to /api/process-resume/stream")
+    if 'resume' not in request.files:
+        return jsonify({"error": "No resume file provided"}), 400
+
+    resume_file = request.files['resume']
+
+    if resume_file.filename == '':
+        return jsonify({"error": "No resume file selected"}), 400
+
+    redaction_mode = get_redaction_mode()
+    if redaction_mode not in REDACTION_MODES:
+        return jsonify({"error": f"Invalid redactionMode, expected one of: {', '.join(REDACTION_MODES)}"}), 400
+
+    def generate():
+        timer = StageTimer()
+        try:
+            with timer.stage("ocr"):
+                cache_key, cache_entry = ocr_resume_cached(resume_file, redaction_mode)
+            if cache_entry is None:
+                yield sse_event("error", {"error": "OCR response does not contain any text"})
+                return
+            resume_text = cache_entry["ocr_text"]
+            yield sse_event("ocr", {"ocr_text": resume_text})
+
+            masked_text = cache_entry["masked"].get(redaction_mode)
+            if masked_text is None:
+                with timer.stage("mask"):
+                    masked_text = redact_pii(resume_text, mode=redaction_mode)
+                cache_masked_text(cache_key, cache_entry, redaction_mode, masked_text)
+            yield sse_event("masked", {"masked_text": masked_text})
+
+            timed_out = 0
+            for kind, payload in iter_suggestions_and_searches(masked_text, timer):
+                if kind == "suggestion":
+                    yield sse_event("job_suggestion", {"job_suggestions": [payload]})
+                    continue
+                timed_out += payload["timed_out"]
+                chunk = {"linkedin_results": [{"title": payload["title"], "result": payload["result"]}]}
+                if payload["index"] == 0:
+                    chunk["linkedin_jobs"] = payload["result"]
+                yield sse_event("linkedin", chunk)
+
+            yield sse_event("done", {"partial": timed_out > 0, "timings": timer.server_timing()})
+
+        except ResumeTooLargeError as e:
+            yield sse_event("error", {"error": str(e)})
+        except Exception as e:
+            print(f"Exception: {str(e)}")
+            yield sse_event("error", {"error": f"Error processing resume: {str(e)}"})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route('/api/process-resumes', methods=['POST'])
+def process_resumes():
+    """OCR and mask a batch of resumes, redacting them together in one pass."""
+    print("Received request to /api/process-resumes")
+    resume_files = [f for f in request.files.getlist('resumes') if f.filename]
+    if not resume_files:
+        return jsonify({"error": "No resume files provided"}), 400
+    if len(resume_files) > MAX_BATCH_RESUMES:
+        return jsonify({"error": f"Too many resumes, at most {MAX_BATCH_RESUMES} per batch"}), 400
+
+    # Tunable per request, but never past what this host can run
+    batch_size = max(1, request.args.get('batchSize', PII_BATCH_SIZE, type=int))
+    n_process = max(1, min(request.args.get('nProcess', PII_N_PROCESS, type=int), os.cpu_count() or 1))
+    redaction_mode = get_redaction_mode()
+    if redaction_mode not in REDACTION_MODES:
+        return jsonify({"error": f"Invalid redactionMode, expected one of: {', '.join(REDACTION_MODES)}"}), 400
+
+    try:
+        # OCR a few documents at a time, keeping per-file failures out of the batch
+        ocr_outcomes = bounded_map(ocr_batch_resume, resume_files, BATCH_OCR_CONCURRENCY)
+        results = []
+        pending = []
+        for resume_file, (cache_key, cache_entry, stats, error) in zip(resume_files, ocr_outcomes):
+            upload_stats().bytes_read += stats.bytes_read
+            upload_stats().bytes_copied += stats.bytes_copied
+            if error is not None:
+                print(f"OCR failed for {resume_file.filename}: {str(error)}")
+                results.append({"filename": resume_file.filename,
+                                "error": f"Error processing resume: {str(error)}"})
+                continue
+            if cache_entry is None:
+                results.append({"filename": resume_file.filename,
+                                "error": "OCR response does not contain any text"})
+                continue
+            result = {"filename": resume_file.filename, "ocr_text": cache_entry["ocr_text"]}
+            masked_text = cache_entry["masked"].get(redaction_mode)
+            if masked_text is None:
+                pending.append((result, cache_key, cache_entry))
+            else:
+                result["masked_text"] = masked_text
+            results.append(result)
+
+        # Mask every document without a cached masked text in a single batched pass
+        print("Masking PII in bulk...")
+        masked_texts = redact_pii_bulk(
+            [result["ocr_text"] for result, _, _ in pending],
+            batch_size=batch_size,
+            n_process=n_process,
+            mode=redaction_mode
+        )
+        for (result, cache_key, cache_entry), masked_text in zip(pending, masked_texts):
+            result["masked_text"] = masked_text
+            cache_masked_text(cache_key, cache_entry, redaction_mode, masked_text)
+
+        return jsonify({"results": results})
+
+    except Exception as e:
+        print(f"Exception: {str(e)}")
+        return jsonify({"error": f"Error processing resumes: {str(e)}"}), 500
+
 @app.route('/api/search-linkedin-jobs', methods=['POST', 'GET'])
 def api_search_linkedin_jobs():
     try:
@@ -250,6 +479,7 @@ def api_search_linkedin_jobs():
             exp_level = data.get('expLevel', '')
             work_type = data.get('workType', '')
             filter_by_company = data.get('filterByCompany', '')
+            limit = data.get('limit')
         else:  # GET request
             job_title = request.args.get('jobTitle')
             if not job_title:
@@ -261,6 +491,11 @@ def api_search_linkedin_jobs():
             exp_level = request.args.get('expLevel', '')
             work_type = request.args.get('workType', '')
             filter_by_company = request.args.get('filterByCompany', '')
+            limit = request.args.get('limit')
+        try:
+            max_jobs = int(limit) if limit else LINKEDIN_SCRAPE_MAX_JOBS
+        except (TypeError, ValueError):
+            return jsonify({"error": "limit must be an integer"}), 400
         
         # Search for jobs using the search function
         jobs = search_linkedin_jobs(
@@ -270,7 +505,8 @@ def api_search_linkedin_jobs():
             job_type, 
             exp_level, 
             work_type, 
-            filter_by_company
+            filter_by_company,
+            max(1, max_jobs)
         )
         
         return jsonify(jobs)
@@ -279,6 +515,10 @@ def api_search_linkedin_jobs():
         print(f"Error in API route: {str(e)}")
         return jsonify({"error": f"Server error processing job search: {str(e)}"}), 500
 
+@app.route('/api/admin/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify({"suggestions": suggestion_cache.stats()})
+
 @app.route('/api/test', methods=['GET'])
 def test_api():
     return jsonify({"status": "success", "message": "API is working!"})
@@ -293,7 +533,7 @@ def test_scraping_api():
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         
         if response.status_code == 200:
             return jsonify({
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+SUGGESTION_CACHE_MAX_ENTRIES = int(os.getenv("SUGGESTION_CACHE_MAX_ENTRIES", "2048"))
+SUGGESTION_CACHE_TTL = int(os.getenv("SUGGESTION_CACHE_TTL", str(7 * 24 * 3600)))
+# Estimated Jaccard similarity of word shingles above which two resumes
+# share suggestions; 1.0 disables near-duplicate hits
+SUGGESTION_CACHE_SIMILARITY = float(os.getenv("SUGGESTION_CACHE_SIMILARITY", "0.9"))
+
+SHINGLE_SIZE = 3
+# 32 bands of 4 rows: pairs at 0.9 similarity share a band with ~100%
+# probability, pairs at 0.5 only ~87% and then fail the exact check
+MINHASH_BANDS = 32
+MINHASH_ROWS = 4
+_MINHASH_PRIME = (1 << 31) - 1
+
+_rng = np.random.default_rng(20240501)
+_MINHASH_A = _rng.integers(1, _MINHASH_PRIME, MINHASH_BANDS * MINHASH_ROWS, dtype=np.int64)
+_MINHASH_B = _rng.integers(0, _MINHASH_PRIME, MINHASH_BANDS * MINHASH_ROWS, dtype=np.int64)
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9<>_]+")
+
+
+def normalize(text):
+    """Lower-case the text and collapse punctuation and whitespace, keeping <ENTITY> masks."""
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def minhash_signature(normalized_text):
+    """MinHash signature of the word shingles of normalized text."""
+    words = normalized_text.split()
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(max(1, len(words) - SHINGLE_SIZE + 1))}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") & _MINHASH_PRIME
+         for s in shingles),
+        dtype=np.int64,
+        count=len(shingles)
+    )
+    # (a * h + b) mod p for every permutation and shingle; a, h < 2^31 fits in int64
+    permuted = (np.outer(_MINHASH_A, hashes) + _MINHASH_B[:, None]) % _MINHASH_PRIME
+    return permuted.min(axis=1)
+
+
+class SuggestionCache:
+    """Cache of Gemini job suggestions keyed on masked resume text.
+
+    Exact hits match a hash of the normalized text. Near-duplicate hits are
+    found through a banded LSH index over MinHash signatures and accepted
+    when the estimated similarity reaches the threshold. Entries expire
+    after the TTL and the least recently used ones are evicted beyond
+    max_entries.
+    """
+
+    def __init__(self, max_entries=SUGGESTION_CACHE_MAX_ENTRIES, ttl=SUGGESTION_CACHE_TTL,
+                 similarity=SUGGESTION_CACHE_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._entries = OrderedDict()  # key -> (signature, suggestions, expires_at)
+        self._buckets = {}  # (band, band hash) -> set of keys
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _fingerprint(text):
+        normalized = normalize(text)
+        key = hashlib.sha256(normalized.encode()).hexdigest()
+        return key, minhash_signature(normalized)
+
+    @staticmethod
+    def _bands(signature):
+        for band in range(MINHASH_BANDS):
+            rows = signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]
+            yield band, rows.tobytes()
+
+    def _remove(self, key):
+        signature, _, _ = self._entries.pop(key)
+        for bucket in self._bands(signature):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def _live(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= now:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, text):
+        """Return cached suggestions for the text or a near duplicate, else None."""
+        key, signature = self._fingerprint(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is not None:
+                self.exact_hits += 1
+                return entry[1]
+
+            if self.similarity < 1.0:
+                candidates = set()
+                for bucket in self._bands(signature):
+                    candidates.update(self._buckets.get(bucket, ()))
+                best, best_similarity = None, self.similarity
+                for candidate in candidates:
+                    entry = self._live(candidate, now)
+                    if entry is None:
+                        continue
+                    similarity = float(np.mean(entry[0] == signature))
+                    if similarity >= best_similarity:
+                        best, best_similarity = entry, similarity
+                if best is not None:
+                    self.near_hits += 1
+                    return best[1]
+
+            self.misses += 1
+            return None
+
+    def set(self, text, suggestions):
+        key, signature = self._fingerprint(text)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (signature, suggestions, time.monotonic() + self.ttl)
+            for bucket in self._bands(signature):
+                self._buckets.setdefault(bucket, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.exact_hits + self.near_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.near_hits) / lookups if lookups else 0.0
+            }
@@ -0,0 +1,69 @@
+import hashlib
+import os
+from contextlib import contextmanager
+from tempfile import SpooledTemporaryFile
+
+# Largest resume accepted, per file
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", str(10 * 1024 * 1024)))
+# Non-seekable uploads are copied into memory up to this size, then to disk
+RESUME_SPOOL_MAX_MEMORY = int(os.getenv("RESUME_SPOOL_MAX_MEMORY", str(1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised when an upload exceeds MAX_RESUME_BYTES."""
+
+
+class UploadStats:
+    """Bytes read from and copied out of the upload streams of one request."""
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.bytes_copied = 0
+
+
+@contextmanager
+def open_upload(file_storage, stats=None, max_bytes=MAX_RESUME_BYTES):
+    """Yield a rewound binary stream of a Werkzeug upload and its SHA-256 hex digest.
+
+    Werkzeug already spools uploads to memory or a temporary file, so a
+    seekable stream is hashed in place and handed on as is, with no copy.
+    Anything else is copied once into a SpooledTemporaryFile while hashing.
+    The stream and any spool are closed when the block exits.
+    """
+    source = file_storage.stream
+    seekable = getattr(source, "seekable", lambda: False)()
+    target = source if seekable else SpooledTemporaryFile(max_size=RESUME_SPOOL_MAX_MEMORY)
+    try:
+        digest = hashlib.sha256()
+        buffer = bytearray(UPLOAD_CHUNK_SIZE)
+        view = memoryview(buffer)
+        size = 0
+        while True:
+            count = source.readinto(buffer) if hasattr(source, "readinto") else None
+            if count is None:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                count = len(chunk)
+                view[:count] = chunk
+            if not count:
+                break
+            size += count
+            if size > max_bytes:
+                raise ResumeTooLargeError(
+                    f"Resume '{file_storage.filename}' exceeds the {max_bytes} byte upload limit"
+                )
+            digest.update(view[:count])
+            if target is not source:
+                target.write(view[:count])
+        target.seek(0)
+
+        if stats is not None:
+            stats.bytes_read += size
+            if target is not source:
+                stats.bytes_copied += size
+
+        yield target, digest.hexdigest()
+    finally:
+        if target is not source:
+            target.close()
+        file_storage.close()
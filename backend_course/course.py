@@ -4,11 +4,13 @@ import re
 import copy
 from flask import Flask, request, jsonify
 import google.generativeai as genai
-import requests
 from dotenv import load_dotenv
 from flask_cors import CORS  # Add this import
 
 load_dotenv()
+# Local modules read their settings from the environment at import
+import http_client
+from enrichment import enrich_all, gemini_limiter, youtube_limiter
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
@@ -25,6 +27,12 @@ if not YOUTUBE_API_KEY:
 
 # Configure Gemini API
 genai.configure(api_key=GEMINI_API_KEY)
+# One model object for the whole process
+gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+
+# "batch" asks for every subsection's keyword in one Gemini call, "per_item"
+# makes one call per subsection
+KEYWORD_MODE = os.getenv('KEYWORD_MODE', 'batch')
 
 VALID_LEVELS = ['beginner', 'intermediate', 'advanced']
 
@@ -85,8 +93,7 @@ IMPORTANT GUIDELINES:
 6. Your response must be valid JSON only, with no additional text before or after.
 """
 
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    response = model.generate_content(
+    response = gemini_model.generate_content(
         prompt,
         generation_config={"response_mime_type": "application/json"}
     )
@@ -107,22 +114,94 @@ IMPORTANT GUIDELINES:
 
     return course_structure
 
+def subsection_key(module, subsection, module_index, subsection_index):
+    """(moduleId, subsectionId) as strings, falling back to 1-based positions."""
+    return (str(module.get('moduleId', module_index)), str(subsection.get('subsectionId', subsection_index)))
+
 def add_youtube_videos(course_structure):
+    """Add a youtubeVideoId to every subsection, enriching subsections concurrently."""
     enhanced_course = copy.deepcopy(course_structure)
-
-    for module in enhanced_course.get('modules', []):
-        for subsection in module.get('subsections', []):
-            search_query = f"{enhanced_course['courseTitle']} {module['moduleTitle']} {subsection['subsectionTitle']}"
-            keyword = get_proper_keyword(search_query, subsection['subsectionTitle'], module['moduleTitle'], enhanced_course['courseTitle'])
-            print(f'Searching YouTube for: "{keyword}"')
-            try:
-                video_id = search_youtube_video(keyword, YOUTUBE_API_KEY)
-                subsection['youtubeVideoId'] = video_id
-            except Exception as e:
-                print(f"Error finding YouTube video for '{keyword}':", e)
-                subsection['youtubeVideoId'] = None
+    course_title = enhanced_course['courseTitle']
+
+    items = [
+        (module, subsection, subsection_key(module, subsection, module_index, subsection_index))
+        for module_index, module in enumerate(enhanced_course.get('modules', []), start=1)
+        for subsection_index, subsection in enumerate(module.get('subsections', []), start=1)
+    ]
+    keywords = get_batch_keywords(enhanced_course, items) if KEYWORD_MODE == 'batch' else {}
+    video_ids = enrich_all(
+        lambda item: find_subsection_video(course_title, item[0], item[1], keywords.get(item[2])), items
+    )
+    for (_, subsection, _), video_id in zip(items, video_ids):
+        subsection['youtubeVideoId'] = video_id
     return enhanced_course
 
+def find_subsection_video(course_title, module, subsection, keyword=None):
+    """Search YouTube for a subsection, generating its keyword first if none is given."""
+    if not keyword:
+        search_query = f"{course_title} {module['moduleTitle']} {subsection['subsectionTitle']}"
+        keyword = get_proper_keyword(search_query, subsection['subsectionTitle'], module['moduleTitle'], course_title)
+    print(f'Searching YouTube for: "{keyword}"')
+    try:
+        return search_youtube_video(keyword, YOUTUBE_API_KEY)
+    except Exception as e:
+        print(f"Error finding YouTube video for '{keyword}':", e)
+        return None
+
+def get_batch_keywords(course_structure, items):
+    """Generate YouTube keywords for all subsections in one Gemini call.
+
+    items are (module, subsection, key) tuples from add_youtube_videos.
+    Returns {key: keyword}; subsections missing from the response, or the
+    whole course if the call fails, are left for per-item generation.
+    """
+    outline = [
+        {
+            "moduleId": key[0],
+            "moduleTitle": module.get('moduleTitle', ''),
+            "subsectionId": key[1],
+            "subsectionTitle": subsection.get('subsectionTitle', '')
+        }
+        for module, subsection, key in items
+    ]
+    if not outline:
+        return {}
+    prompt = f"""
+Generate a short and effective keyword that can be searched for on YouTube for each subsection of the course "{course_structure.get('courseTitle', '')}".
+For each subsection, give top priority to its subsectionTitle followed by its moduleTitle and then the course title.
+Each keyword should not be more than 4 words and should be a short phrase relevant to the topic.
+
+Subsections:
+{json.dumps(outline, indent=2)}
+
+Respond ONLY with a JSON array containing one object per subsection, in this format:
+[{{"moduleId": "1", "subsectionId": "1", "keyword": "short keyword"}}]
+"""
+    try:
+        gemini_limiter.acquire()
+        response = gemini_model.generate_content(
+            prompt,
+            generation_config={"response_mime_type": "application/json"}
+        )
+        entries = json.loads(response.text.strip())
+    except Exception as e:
+        print("Error generating batch keywords:", e)
+        return {}
+
+    keywords = {}
+    if isinstance(entries, dict):
+        entries = entries.get('keywords', [])
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        keyword = entry.get('keyword')
+        if isinstance(keyword, str) and keyword.strip():
+            keywords[(str(entry.get('moduleId')), str(entry.get('subsectionId')))] = keyword.strip()
+    missing = len([1 for _, _, key in items if key not in keywords])
+    if missing:
+        print(f"Batch keywords missing for {missing} of {len(items)} subsections; generating them individually.")
+    return keywords
+
 def get_proper_keyword(search_query, subsection_title, module_title, course_title):
     prompt = f"""
 Generate a short and effective keyword that can be searched for on YouTube for the following search query:
@@ -130,8 +209,8 @@ Generate a short and effective keyword that can be searched for on YouTube for t
 The keyword should not be more than 4 words and should be a short phrase relevant to the topic.
 """
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        response = model.generate_content(prompt)
+        gemini_limiter.acquire()
+        response = gemini_model.generate_content(prompt)
         keyword = response.text.strip()
         return keyword
     except Exception as e:
@@ -150,7 +229,8 @@ def search_youtube_video(query, api_key):
         'videoDuration': 'medium'
     }
 
-    response = requests.get(url, params=params)
+    youtube_limiter.acquire()
+    response = http_client.get(url, params=params)
     data = response.json()
 
     if 'items' in data and len(data['items']) > 0:
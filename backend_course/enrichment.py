@@ -0,0 +1,62 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Subsections enriched at once across all requests
+ENRICH_MAX_WORKERS = int(os.getenv("ENRICH_MAX_WORKERS", "8"))
+# Provider quotas, shared by every worker in this process
+GEMINI_REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "60"))
+YOUTUBE_REQUESTS_PER_MINUTE = float(os.getenv("YOUTUBE_REQUESTS_PER_MINUTE", "60"))
+
+executor = ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS, thread_name_prefix="enrich")
+
+
+class RateLimiter:
+    """Token bucket allowing requests_per_minute calls, in bursts of up to burst.
+
+    acquire() blocks until a token is free. A rate of 0 or less disables
+    limiting.
+    """
+
+    def __init__(self, requests_per_minute, burst=None):
+        self.rate = requests_per_minute / 60.0
+        self.burst = burst or max(1, min(ENRICH_MAX_WORKERS, int(requests_per_minute)))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+gemini_limiter = RateLimiter(GEMINI_REQUESTS_PER_MINUTE)
+youtube_limiter = RateLimiter(YOUTUBE_REQUESTS_PER_MINUTE)
+
+
+def enrich_all(fn, items, default=None):
+    """Call fn(item) for every item on the worker pool and return results in order.
+
+    A call that raises is logged and gets default, so one failing item
+    doesn't lose the others.
+    """
+    futures = [executor.submit(fn, item) for item in items]
+    results = []
+    for index, future in enumerate(futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            print(f"Enrichment failed for item {index}:", e)
+            results.append(default)
+    return results
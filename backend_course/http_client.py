@@ -0,0 +1,56 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Default (connect, read) timeouts for every outbound call, in seconds
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+# Retries for connection errors and 429/5xx responses, with exponential
+# backoff plus random jitter so workers don't retry in lockstep
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_BACKOFF_JITTER = float(os.getenv("HTTP_BACKOFF_JITTER", "0.5"))
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Pools live per gunicorn worker process. HTTP_POOL_CONNECTIONS is the number
+# of hosts kept pooled; HTTP_POOL_MAXSIZE the keep-alive connections per host,
+# which should cover the worker's --threads plus any fan-out threads.
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "8"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+DEFAULT_TIMEOUT = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+
+def create_session():
+    """Build a requests session with pooled keep-alive connections and retries."""
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        backoff_jitter=HTTP_BACKOFF_JITTER,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        # Hand the last response back so callers can report its status
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared by every request thread in the process; the adapter's connection
+# pools are thread-safe
+session = create_session()
+
+
+def get(url, params=None, timeout=None, **kwargs):
+    """GET through the shared session, applying the default timeouts."""
+    return session.get(url, params=params, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
@@ -0,0 +1,93 @@
+"""Benchmark the women-related relevance checks: the old per-keyword
+substring scans vs one KeywordMatcher pass per article.
+
+Generates synthetic NewsAPI articles, runs both implementations of the
+filter and the relevance score, and checks that they agree.
+
+Usage: python bench_keywords.py [articles]
+"""
+import random
+import sys
+import time
+from news import WOMEN_KEYWORDS, article_keyword_hits, get_personalized_articles
+
+FILLER = (
+    "the company announced quarterly results as markets rallied on news of a new policy "
+    "framework for startups technology investment infrastructure and rural employment"
+).split()
+
+
+def legacy_is_women_related(text):
+    if not text:
+        return False
+    text = text.lower()
+    for keyword in WOMEN_KEYWORDS:
+        if keyword.lower() in text:
+            return True
+    return False
+
+
+def legacy_filter(articles):
+    """The original four checks: title, >= 2 keywords, any keyword, relevance score."""
+    women_articles, maybe_related, scores = [], [], []
+    for article in articles:
+        title = article.get("title", "")
+        description = article.get("description", "")
+        content = article.get("content", "")
+        full_text = f"{title} {description} {content}".lower()
+        if legacy_is_women_related(title) or sum(keyword.lower() in full_text for keyword in WOMEN_KEYWORDS) >= 2:
+            women_articles.append(article)
+        elif any(keyword.lower() in full_text for keyword in WOMEN_KEYWORDS):
+            maybe_related.append(article)
+        scores.append(sum(1 for kw in WOMEN_KEYWORDS if kw.lower() in
+                          f"{article.get('title', '')} {article.get('description', '')}".lower()))
+    return women_articles + maybe_related, scores
+
+
+def matcher_filter(articles):
+    keyword_hits = {id(article): article_keyword_hits(article) for article in articles}
+    filtered = get_personalized_articles("", articles, keyword_hits)
+    return filtered, [len(keyword_hits[id(article)].summary) for article in articles]
+
+
+def sentence(rng, words, keyword_chance):
+    parts = [rng.choice(FILLER) for _ in range(words)]
+    for i in range(len(parts)):
+        if rng.random() < keyword_chance:
+            parts[i] = rng.choice(WOMEN_KEYWORDS)
+    return " ".join(parts).capitalize()
+
+
+def sample_articles(count, rng):
+    articles = []
+    for _ in range(count):
+        article = {
+            "title": sentence(rng, 10, 0.03),
+            "description": sentence(rng, 30, 0.01),
+            "content": sentence(rng, 40, 0.01) + " [+2431 chars]",
+        }
+        if rng.random() < 0.05:
+            article["description"] = None
+        articles.append(article)
+    return articles
+
+
+def timed(label, fn, articles):
+    start = time.perf_counter()
+    result = fn(articles)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(articles)} articles  {elapsed * 1000:8.1f} ms  {elapsed / len(articles) * 1e6:7.1f} us/article")
+    return result, elapsed
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    articles = sample_articles(count, random.Random(7))
+
+    (old_articles, old_scores), before = timed("legacy", legacy_filter, articles)
+    (new_articles, new_scores), after = timed("matcher", matcher_filter, articles)
+    # get_personalized_articles returns everything when fewer than 5 match
+    if len(old_articles) >= 5:
+        assert [id(a) for a in old_articles] == [id(a) for a in new_articles], "filtered articles differ"
+    assert old_scores == new_scores, "relevance scores differ"
+    print(f"{len(new_articles)} articles kept, results identical, speedup: {before / after:.1f}x")
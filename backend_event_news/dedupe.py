@@ -0,0 +1,94 @@
+import hashlib
+import os
+import re
+import numpy as np
+
+# Fingerprints this many bits apart or fewer are the same story
+NEWS_DEDUPE_MAX_DISTANCE = int(os.getenv("NEWS_DEDUPE_MAX_DISTANCE", "10"))
+
+SIMHASH_BITS = 64
+_WORD_RE = re.compile(r"\w+")
+
+
+def _features(text):
+    """Words and word pairs of the text, lower-cased."""
+    words = _WORD_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash_fingerprints(texts):
+    """64-bit SimHash of each text, or None for texts without words.
+
+    Feature hashes for all texts are unpacked into one bit matrix and summed
+    per text, so the whole batch is fingerprinted in a single NumPy pass.
+    """
+    hashes, starts, owners = [], [], []
+    for index, text in enumerate(texts):
+        features = _features(text)
+        if features:
+            starts.append(len(hashes))
+            owners.append(index)
+            hashes.extend(_feature_hash(feature) for feature in features)
+    fingerprints = [None] * len(texts)
+    if not hashes:
+        return fingerprints
+
+    # One row of 64 bits per feature hash, least significant bit first
+    bits = np.unpackbits(np.array(hashes, dtype="<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    # Each text's features are contiguous, so per-text bit counts are one reduceat
+    starts = np.array(starts)
+    ones = np.add.reduceat(bits, starts, axis=0, dtype=np.uint32)
+    lengths = np.diff(np.append(starts, len(hashes)))
+    # A bit is set when more of the text's features have it set than not
+    majority = ones * 2 > lengths[:, None]
+    packed = np.packbits(majority, axis=1, bitorder="little").view("<u8").ravel()
+    for index, fingerprint in zip(owners, packed.tolist()):
+        fingerprints[index] = fingerprint
+    return fingerprints
+
+
+def _bands(max_distance):
+    """Bit ranges splitting the fingerprint into max_distance + 1 bands.
+
+    Two fingerprints within max_distance bits differ in at most that many
+    bands, so they agree exactly on at least one.
+    """
+    edges = np.linspace(0, SIMHASH_BITS, max_distance + 2).astype(int)
+    return [(int(start), (1 << int(end - start)) - 1) for start, end in zip(edges, edges[1:])]
+
+
+def dedupe_articles(articles, max_distance=NEWS_DEDUPE_MAX_DISTANCE):
+    """Keep the first article of each near-duplicate story, in order.
+
+    Articles are compared on title and description. Each kept article is
+    indexed by its fingerprint bands, and a new article is only compared
+    with the kept articles in its own buckets rather than with all of them,
+    so the pass stays linear in practice. Articles without text are always
+    kept.
+    """
+    texts = [f"{article.get('title') or ''} {article.get('description') or ''}" for article in articles]
+    fingerprints = simhash_fingerprints(texts)
+    bands = _bands(max_distance)
+    buckets = [{} for _ in bands]
+    kept = []
+
+    for article, fingerprint in zip(articles, fingerprints):
+        if fingerprint is None:
+            kept.append(article)
+            continue
+        keys = [(fingerprint >> shift) & mask for shift, mask in bands]
+        duplicate = any(
+            bin(fingerprint ^ other).count("1") <= max_distance
+            for band, key in enumerate(keys)
+            for other in buckets[band].get(key, ())
+        )
+        if duplicate:
+            continue
+        kept.append(article)
+        for band, key in enumerate(keys):
+            buckets[band].setdefault(key, []).append(fingerprint)
+    return kept
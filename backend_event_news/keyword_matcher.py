@@ -0,0 +1,79 @@
+import re
+from collections import Counter
+
+_WORD_CHAR_RE = re.compile(r"\w")
+
+
+def _trie_pattern(node):
+    """Regex for the keywords in a trie, longest alternatives tried first."""
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if terminal:
+        return f"(?:{body})?" if len(branches) == 1 else f"{body}?"
+    return body
+
+
+class KeywordMatcher:
+    """Find every occurrence of a fixed set of keywords in one pass over a text.
+
+    Keywords are lower-cased and compiled once into a single regex shaped
+    like a trie, so the engine follows one branch per character instead of
+    trying each keyword in turn. The regex is a lookahead, so it reports the
+    longest keyword starting at every offset; keywords that are prefixes of
+    it come from a table. Matching is by substring, like `keyword in text`,
+    and overlapping keywords are all reported ("women" and "women leaders"
+    in "women leaders"). With whole_words, a keyword only matches where it
+    is not part of a longer word, so "ai" doesn't match "maintained". Texts
+    passed in must already be lower-cased.
+    """
+
+    def __init__(self, keywords, whole_words=False):
+        self.whole_words = whole_words
+        self.keywords = []
+        trie = {}
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword and keyword not in self.keywords:
+                self.keywords.append(keyword)
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[""] = True
+
+        pattern = _trie_pattern(trie)
+        if whole_words:
+            pattern = f"(?<!\\w)(?=({pattern})(?!\\w))"
+        else:
+            pattern = f"(?=({pattern}))"
+        self._pattern = re.compile(pattern) if self.keywords else None
+        # Keyword -> every keyword that is a prefix of it, itself included
+        self._prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def iter_matches(self, text):
+        """Yield (end offset, keyword) for every occurrence, in order of start offset."""
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            for keyword in self._prefixes[match.group(1)]:
+                end = start + len(keyword)
+                # A shorter keyword can end inside a word the longest one spans
+                if self.whole_words and _WORD_CHAR_RE.match(text, end):
+                    continue
+                yield end, keyword
+
+    def count(self, text):
+        """Hits per keyword found in text."""
+        return Counter(keyword for _, keyword in self.iter_matches(text))
+
+    def contains_any(self, text):
+        return self._pattern is not None and self._pattern.search(text) is not None
@@ -3,7 +3,12 @@ from newsapi import NewsApiClient
 from flask_cors import CORS
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, namedtuple
+from functools import lru_cache
 from dotenv import load_dotenv
+from keyword_matcher import KeywordMatcher
+from scoring import BM25FScorer, top_k
 
 
 app = Flask(__name__)
@@ -13,6 +18,10 @@ CORS(app)
 
 # Load environment variables from .env file
 load_dotenv()
+# Local modules read their settings from the environment at import
+from response_cache import ResponseCache
+from news_feed import TrendingFeeds
+from dedupe import dedupe_articles
 
 # Get the API key
 api_key = os.getenv("NEWS_API_KEY")
@@ -21,6 +30,17 @@ api_key = os.getenv("NEWS_API_KEY")
 # Initialize the client
 newsapi = NewsApiClient(api_key=api_key)
 
+# NewsAPI responses keyed on (query, language, sort_by, page_size); job
+# titles repeat heavily and NewsAPI rate limits are tight
+news_cache = ResponseCache(
+    max_entries=int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "512")),
+    ttl=int(os.getenv("NEWS_CACHE_TTL", "600")),  # Served as fresh
+    stale_ttl=int(os.getenv("NEWS_CACHE_STALE_TTL", "3600"))  # Served while refreshing
+)
+
+# Runs the enhanced and fallback NewsAPI queries of a request side by side
+fetch_executor = ThreadPoolExecutor(max_workers=int(os.getenv("NEWS_FETCH_WORKERS", "8")), thread_name_prefix="news-fetch")
+
 
 
 # Keywords related to women-focused topics
@@ -60,22 +80,99 @@ WOMEN_KEYWORDS = [
 ]
 
 
+# Ranking weight per keyword (1.0 when not listed); broad identifiers count
+# for less than specific topics
+KEYWORD_WEIGHTS = {
+    'women': 0.5, 'woman': 0.5, 'female': 0.5, 'girl': 0.5, 'girls': 0.5,
+    'ladies': 0.5, 'womens': 0.5, "women's": 0.5, 'lady': 0.5,
+    'shakti': 0.75, 'empowerment': 0.75, 'maternal': 0.75, 'maternity': 0.75,
+}
+# Ranking weight of each word of the user's query, and of the whole query
+QUERY_TERM_WEIGHT = 2.0
+QUERY_STOPWORDS = {'a', 'an', 'and', 'or', 'not', 'the', 'of', 'in', 'for', 'to', 'at', 'on', 'with'}
+# Articles returned by /get-news
+NEWS_RESULTS_LIMIT = 20
+
+# Compiled once at import; each article is scanned a single time and every
+# relevance check reuses the hit counts
+women_matcher = KeywordMatcher(WOMEN_KEYWORDS)
+
+# Hits per keyword in an article's title, its title and description, and
+# its title, description and content
+KeywordHits = namedtuple("KeywordHits", ["title", "summary", "full"])
+
+
 def is_women_related(text):
     """Check if the article is related to women's topics."""
     if not text:
         return False
     
-    text = text.lower()
-    
-    # Check for any of the women-related keywords
-    for keyword in WOMEN_KEYWORDS:
-        if keyword.lower() in text:
-            return True
-    
-    return False
+    return women_matcher.contains_any(text.lower())
+
+def article_keyword_hits(article, matcher=women_matcher):
+    """Keyword hits in an article, from one pass over its text."""
+    title = article.get("title", "")
+    description = article.get("description", "")
+    content = article.get("content", "")
+
+    # The title and title + description are prefixes of the full text, so a
+    # match that ends within a prefix is a match in that field
+    title_end = len(f"{title}".lower()) if title else 0
+    summary_end = len(f"{title} {description}".lower())
+    full_text = f"{title} {description} {content}".lower()
+
+    hits = KeywordHits(Counter(), Counter(), Counter())
+    for end, keyword in matcher.iter_matches(full_text):
+        hits.full[keyword] += 1
+        if end <= summary_end:
+            hits.summary[keyword] += 1
+            if end <= title_end:
+                hits.title[keyword] += 1
+    return hits
+
+@lru_cache(maxsize=256)
+def query_term_matcher(query):
+    """Matcher for the words of a search query, plus the whole query as a phrase.
+
+    Terms match whole words only, so a short query word like "ai" or "hr"
+    doesn't score on every article containing "said" or "three".
+    """
+    words = [word.strip(".-'") for word in re.findall(r"[\w'+#.-]+", query.lower())]
+    words = [word for word in words if len(word) > 1 and word not in QUERY_STOPWORDS]
+    terms = words + [" ".join(words)] if len(words) > 1 else words
+    return KeywordMatcher(terms, whole_words=True)
+
+scorer = BM25FScorer()
+
+def rank_articles(query, articles, keyword_hits, k=NEWS_RESULTS_LIMIT):
+    """The k most relevant articles, scored by BM25F over women keywords and query terms."""
+    query_matcher = query_term_matcher(query)
+    term_weights = {keyword: KEYWORD_WEIGHTS.get(keyword, 1.0) for keyword in women_matcher.keywords}
+    for term in query_matcher.keywords:
+        term_weights[term] = max(term_weights.get(term, 0.0), QUERY_TERM_WEIGHT)
+
+    fields = ("title", "description", "content")
+    field_counts = {field: [] for field in fields}
+    field_lengths = {field: [] for field in fields}
+    for article in articles:
+        # Union, not sum, so a query word that is also a keyword isn't counted twice
+        hits = keyword_hits[id(article)]
+        query_hits = article_keyword_hits(article, query_matcher)
+        field_counts["title"].append(hits.title | query_hits.title)
+        field_counts["description"].append((hits.summary - hits.title) | (query_hits.summary - query_hits.title))
+        field_counts["content"].append((hits.full - hits.summary) | (query_hits.full - query_hits.summary))
+        for field in fields:
+            field_lengths[field].append(len(str(article.get(field) or "").split()))
+
+    scores = scorer.score(field_counts, field_lengths, term_weights)
+    return [articles[index] for index in top_k(scores, k)]
+
+def get_personalized_articles(query, articles, keyword_hits=None):
+    """Filter and rank articles based on women-focused content.
 
-def get_personalized_articles(query, articles):
-    """Filter and rank articles based on women-focused content."""
+    keyword_hits maps id(article) to its article_keyword_hits, for callers
+    that have already scanned the articles.
+    """
     women_articles = []
     maybe_related = []
     
@@ -83,17 +180,12 @@ def get_personalized_articles(query, articles):
     enhanced_query = f"{query} AND (women OR female OR gender OR empowerment OR leadership)"
     
     for article in articles:
-        title = article.get("title", "")
-        description = article.get("description", "")
-        content = article.get("content", "")
-        
-        # Combine all text fields for comprehensive analysis
-        full_text = f"{title} {description} {content}".lower()
+        hits = keyword_hits[id(article)] if keyword_hits else article_keyword_hits(article)
         
         # Check if the article is strongly women-related
-        if is_women_related(title) or sum(keyword.lower() in full_text for keyword in WOMEN_KEYWORDS) >= 2:
+        if hits.title or len(hits.full) >= 2:
             women_articles.append(article)
-        elif any(keyword.lower() in full_text for keyword in WOMEN_KEYWORDS):
+        elif hits.full:
             maybe_related.append(article)
     
     # Prioritize articles that are strongly women-related, then append maybe related
@@ -105,6 +197,63 @@ def get_personalized_articles(query, articles):
     
     return prioritized_articles
 
+def fetch_everything(query, language='en', sort_by='relevancy', page_size=30):
+    """newsapi.get_everything through the cache; concurrent misses share one call."""
+    key = (" ".join(query.lower().split()), language, sort_by, page_size)
+    return news_cache.get_or_fetch(key, lambda: newsapi.get_everything(
+        q=query,
+        language=language,
+        sort_by=sort_by,
+        page_size=page_size
+    ))
+
+@app.route('/admin/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify({"news": news_cache.stats(), "feeds": trending_feeds.stats()})
+
+def build_news_feed(query):
+    """Fetch, filter and rank the articles returned for a query."""
+    # Ask for articles with the specific query plus women-related terms
+    # and, in parallel, with the original query as a fallback
+    enhanced_query = f"{query} AND (women OR female OR gender OR empowerment)"
+    enhanced = fetch_executor.submit(fetch_everything, enhanced_query)
+    fallback = fetch_executor.submit(fetch_everything, query)
+    
+    articles = enhanced.result().get('articles', [])
+    
+    # If we don't get enough articles with the enhanced query, use the original query
+    if len(articles) < 10:
+        articles = fallback.result().get('articles', [])
+    
+    # The same wire story often comes from several outlets; keep one copy
+    articles = dedupe_articles(articles)
+    
+    # Scan each article for women-related keywords once, then apply our
+    # custom filtering to focus on women-related content
+    keyword_hits = {id(article): article_keyword_hits(article) for article in articles}
+    filtered_articles = get_personalized_articles(query, articles, keyword_hits)
+    
+    # Keep the most relevant articles, best first
+    result = []
+    
+    for article in rank_articles(query, filtered_articles, keyword_hits):
+        result.append({
+            "title": article.get("title"),
+            "description": article.get("description") or "No description available.",
+            "content": article.get("content") or "No content available.",
+            "source": article.get("source", {}).get("name"),
+            "publishedAt": article.get("publishedAt"),
+            "url": article.get("url"),
+            "urlToImage": article.get("urlToImage") or "No image available."
+        })
+    
+    return result
+
+# Feeds for the most requested queries, rebuilt in the background and
+# served from memory
+trending_feeds = TrendingFeeds(build_news_feed)
+trending_feeds.start()
+
 @app.route('/get-news', methods=['GET', 'POST'])
 def get_news():
     if request.method == 'POST':
@@ -117,52 +266,9 @@ def get_news():
         return jsonify({"error": "Please provide a query"}), 400
     
     try:
-        # First attempt: Try to get articles with the specific query plus women-related terms
-        enhanced_query = f"{query} AND (women OR female OR gender OR empowerment)"
-        response = newsapi.get_everything(
-            q=enhanced_query,
-            language='en',
-            sort_by='relevancy',
-            page_size=30  # Fetch more articles to have enough after filtering
-        )
-        
-        articles = response.get('articles', [])
-        
-        # If we don't get enough articles with the enhanced query, try the original query
-        if len(articles) < 10:
-            response = newsapi.get_everything(
-                q=query,
-                language='en',
-                sort_by='relevancy',
-                page_size=30
-            )
-            articles = response.get('articles', [])
-        
-        # Apply our custom filtering to focus on women-related content
-        filtered_articles = get_personalized_articles(query, articles)
-        
-        result = []
-        
-        for article in filtered_articles[:20]:  # Limit to 20 results
-            result.append({
-                "title": article.get("title"),
-                "description": article.get("description") or "No description available.",
-                "content": article.get("content") or "No content available.",
-                "source": article.get("source", {}).get("name"),
-                "publishedAt": article.get("publishedAt"),
-                "url": article.get("url"),
-                "urlToImage": article.get("urlToImage") or "No image available.",
-                "relevanceScore": sum(1 for kw in WOMEN_KEYWORDS if kw.lower() in 
-                                    f"{article.get('title', '')} {article.get('description', '')}".lower())
-            })
-        
-        # Sort by relevance score as a final step
-        result.sort(key=lambda x: x.get("relevanceScore", 0), reverse=True)
-        
-        # Remove the relevance score before sending to frontend if you don't need it there
-        for article in result:
-            if "relevanceScore" in article:
-                del article["relevanceScore"]
+        result = trending_feeds.get(query)
+        if result is None:
+            result = build_news_feed(query)
         
         return jsonify({"query": query, "articles": result})
     
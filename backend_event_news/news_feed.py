@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+# Number of most requested queries kept pre-ranked in memory
+NEWS_FEED_TOP_N = int(os.getenv("NEWS_FEED_TOP_N", "30"))
+# Seconds between background refresh passes; 0 disables the refresher
+NEWS_FEED_REFRESH_INTERVAL = int(os.getenv("NEWS_FEED_REFRESH_INTERVAL", "300"))
+# Upper bound on the serialized size of all stored feeds
+NEWS_FEED_MAX_BYTES = int(os.getenv("NEWS_FEED_MAX_BYTES", str(16 * 1024 * 1024)))
+# Feeds not requested for this long are dropped
+NEWS_FEED_COLD_AFTER = int(os.getenv("NEWS_FEED_COLD_AFTER", "3600"))
+
+
+def feed_key(query):
+    return " ".join(query.lower().split())
+
+
+class TrendingFeeds:
+    """Pre-ranked news feeds for the most requested queries.
+
+    Every request is counted, and a background pass rebuilds the feeds of
+    the top_n queries with build(query), so requests for them are answered
+    from memory. Counts are halved on each pass so queries that stop being
+    requested drop out; their feeds are evicted once unused for cold_after
+    seconds, and the least requested feeds go first when the stored feeds
+    exceed max_bytes.
+    """
+
+    def __init__(self, build, top_n=NEWS_FEED_TOP_N, max_bytes=NEWS_FEED_MAX_BYTES,
+                 cold_after=NEWS_FEED_COLD_AFTER, interval=NEWS_FEED_REFRESH_INTERVAL):
+        self.build = build
+        self.top_n = top_n
+        self.max_bytes = max_bytes
+        self.cold_after = cold_after
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._hits = Counter()
+        self._queries = {}  # key -> query text as first requested
+        self._feeds = {}  # key -> (feed, size in bytes, built_at)
+        self._last_hit = {}
+        self._bytes = 0
+        self._refresher = None
+        self.served = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    def get(self, query):
+        """Count a request for query and return its stored feed, or None."""
+        key = feed_key(query)
+        now = time.monotonic()
+        with self._lock:
+            self._hits[key] += 1
+            self._queries.setdefault(key, query)
+            self._last_hit[key] = now
+            entry = self._feeds.get(key)
+            # A feed the refresher hasn't renewed for two passes is too old to serve
+            if entry is None or (self.interval > 0 and now - entry[2] > 2 * self.interval):
+                return None
+            self.served += 1
+            return entry[0]
+
+    def _store(self, key, feed):
+        size = len(json.dumps(feed))
+        with self._lock:
+            old = self._feeds.get(key)
+            if old is not None:
+                self._bytes -= old[1]
+            self._feeds[key] = (feed, size, time.monotonic())
+            self._bytes += size
+
+    def _evict(self, key):
+        """Drop a stored feed. Call with the lock held."""
+        _, size, _ = self._feeds.pop(key)
+        self._bytes -= size
+        self.evictions += 1
+
+    def refresh(self):
+        """Rebuild the feeds of the most requested queries, then evict cold ones."""
+        now = time.monotonic()
+        with self._lock:
+            popular = [
+                (key, self._queries[key]) for key, _ in self._hits.most_common(self.top_n)
+                if now - self._last_hit[key] <= self.cold_after
+            ]
+            # Halve every count so queries that have gone cold drop out
+            self._hits = Counter({key: count // 2 for key, count in self._hits.items() if count > 1})
+
+        for key, query in popular:
+            try:
+                self._store(key, self.build(query))
+                self.refreshes += 1
+            except Exception as e:
+                print(f"News feed refresh failed for {query!r}: {e}")
+
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key in self._feeds if now - self._last_hit.get(key, 0) > self.cold_after]:
+                self._evict(key)
+            by_popularity = sorted(self._feeds, key=lambda key: self._hits.get(key, 0))
+            while self._bytes > self.max_bytes and by_popularity:
+                self._evict(by_popularity.pop(0))
+            # Forget queries that are neither counted nor stored
+            for key in [key for key in self._queries if key not in self._hits and key not in self._feeds]:
+                del self._queries[key]
+                self._last_hit.pop(key, None)
+
+    def start(self):
+        """Run refresh every interval seconds on a daemon thread."""
+        if self.interval <= 0 or self._refresher is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"News feed refresher error: {e}")
+
+        self._refresher = threading.Thread(target=run, name="news-feed-refresher", daemon=True)
+        self._refresher.start()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "feeds": len(self._feeds),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "tracked_queries": len(self._hits),
+                "served": self.served,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,60 @@
+import heapq
+import numpy as np
+
+# Relative weight of a term occurrence in each article field
+FIELD_WEIGHTS = {"title": 3.0, "description": 1.5, "content": 1.0}
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class BM25FScorer:
+    """BM25F relevance scores for a pool of candidate articles.
+
+    Term frequencies are weighted per field and normalized by field length
+    before saturation, and each term contributes its own weight times its
+    IDF over the pool. All articles are scored at once from a
+    term-frequency matrix per field.
+    """
+
+    def __init__(self, field_weights=FIELD_WEIGHTS, k1=BM25_K1, b=BM25_B):
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+
+    def score(self, field_counts, field_lengths, term_weights):
+        """Return an array with one score per article.
+
+        field_counts maps each field to a list with a {term: hits} mapping
+        per article, field_lengths maps each field to the articles' lengths
+        in words, and term_weights maps every term to score to its weight.
+        """
+        terms = list(term_weights)
+        rows = len(next(iter(field_counts.values()), []))
+        if not terms or not rows:
+            return np.zeros(rows)
+        columns = {term: column for column, term in enumerate(terms)}
+
+        weighted_tf = np.zeros((rows, len(terms)))
+        for field, weight in self.field_weights.items():
+            tf = np.zeros((rows, len(terms)))
+            for row, counts in enumerate(field_counts.get(field, ())):
+                for term, hits in counts.items():
+                    column = columns.get(term)
+                    if column is not None:
+                        tf[row, column] = hits
+            lengths = np.asarray(field_lengths.get(field, np.zeros(rows)), dtype=float)
+            average = lengths.mean()
+            norm = 1 - self.b + self.b * lengths / average if average > 0 else np.ones(rows)
+            weighted_tf += weight * tf / norm[:, None]
+
+        document_frequency = np.count_nonzero(weighted_tf, axis=0)
+        idf = np.log1p((rows - document_frequency + 0.5) / (document_frequency + 0.5))
+        saturated = weighted_tf * (self.k1 + 1) / (weighted_tf + self.k1)
+        return saturated @ (idf * np.array([term_weights[term] for term in terms]))
+
+
+def top_k(scores, k):
+    """Indices of the k highest scores, best first; ties keep pool order."""
+    scores = scores.tolist() if isinstance(scores, np.ndarray) else list(scores)
+    return heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)